@@ -1,151 +1,296 @@
 # llm.py
 from __future__ import annotations
 
+import hashlib
+import itertools
 import json
+import random
 import re
-from dataclasses import dataclass
-from typing import Any, Dict, Optional, List
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterator, Optional, List, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:  # optional: faster JSON encode/decode on the LLM hot path
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _new_session(pool_size: int = 16) -> requests.Session:
+    """
+    Keep-alive session with a connection pool, so repeated Ollama calls
+    skip the TCP connect per request.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Connection": "keep-alive", "Accept-Encoding": "gzip, deflate"})
+    return session
+
+
+# shared by the /api/tags probe and OllamaLLM, so the probe's connection is reused
+_SESSION_POOL_SIZE = 16
+_SESSION = _new_session(_SESSION_POOL_SIZE)
+# HTTP statuses worth another attempt: overloaded or restarting server, rate limiting
+_RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+
+class _ReplyDeadline(requests.Timeout):
+    """The whole streamed reply overran its cap (see _reply_cap); a retry would decode it all again."""
+
+
+def _is_transient(e: Exception) -> bool:
+    # connect and first-byte timeouts are worth another attempt, a reply that was still
+    # decoding at the deadline is not: each retry would burn a full generation again
+    if isinstance(e, _ReplyDeadline):
+        return False
+    if isinstance(e, (requests.Timeout, requests.ConnectionError, requests.exceptions.ChunkedEncodingError)):
+        return True
+    return isinstance(e, requests.HTTPError) and e.response is not None and e.response.status_code in _RETRY_STATUSES
+
+
+# request bodies are encoded with _dumps (orjson when available) instead of requests' json=
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+_FENCE_RE = re.compile(r"```(?:json)?", re.IGNORECASE)
+_JSON_START_RE = re.compile(r"[\[{]")
 
 
 def ollama_is_available(base_url: str = "http://localhost:11434", timeout: int = 2) -> bool:
     try:
-        r = requests.get(f"{base_url}/api/tags", timeout=timeout)
+        r = _SESSION.get(f"{base_url}/api/tags", timeout=timeout)
         return r.status_code == 200
     except Exception:
         return False
 
 
-def _extract_json_object(text: str) -> Optional[str]:
+# Per-state tables of the characters the bracket tracker has to look at; everything
+# else is skipped by the regex engine. Inside a string only '"' and backslash matter,
+# outside only the bracket pair and '"', so each state scans for its own set.
+_JSON_STRUCT_RES = {
+    "{": re.compile(r'[{}"]'),
+    "[": re.compile(r'[\[\]"]'),
+}
+_JSON_STRING_RE = re.compile(r'["\\]')
+
+
+class _JsonCloseTracker:
+    """
+    Incremental bracket counter for a (possibly streamed) JSON value.
+    Ignores everything before the first open_ch and brackets inside string literals.
+    """
+    def __init__(self, open_ch: str = "{") -> None:
+        # the closing bracket is implied by open_ch: it is the only other bracket in its regex
+        self.open_ch = open_ch
+        self._struct_re = _JSON_STRUCT_RES[open_ch]
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+
+    def feed(self, delta: str, start: int = 0) -> int:
+        """Return the index in delta that closes the top-level value, or -1."""
+        open_ch = self.open_ch
+        i = start
+        if self.escape:
+            if i >= len(delta):
+                return -1
+            self.escape = False
+            i += 1  # char escaped by a backslash at the end of the previous delta
+        # only structural chars reach Python code; runs of plain text are skipped in C
+        struct_search = self._struct_re.search
+        string_search = _JSON_STRING_RE.search
+        while True:
+            if self.in_string:
+                m = string_search(delta, i)
+                if m is None:
+                    return -1
+                i = m.end()
+                if delta[i - 1] == '"':
+                    self.in_string = False
+                elif i >= len(delta):
+                    self.escape = True  # backslash was the last char of this delta
+                    return -1
+                else:
+                    i += 1
+                continue
+            m = struct_search(delta, i)
+            if m is None:
+                return -1
+            i = m.end()
+            c = delta[i - 1]
+            if c == open_ch:
+                self.depth += 1
+            elif self.depth == 0:
+                continue  # prose before the value
+            elif c == '"':
+                self.in_string = True
+            else:
+                self.depth -= 1
+                if self.depth == 0:
+                    return i - 1
+
+
+def _find_json_span(text: str, start: int) -> int:
+    """Index of the bracket closing the value opened at text[start], or -1."""
+    return _JsonCloseTracker(text[start]).feed(text, start)
+
+
+def _extract_json_value(text: str) -> Optional[Any]:
     """
-    Best-effort: extract first valid JSON object/array from an LLM response.
-    Handles prose + code fences.
+    Best-effort: parse the first valid JSON object/array in an LLM response.
+    Handles prose + code fences. Returns the parsed value, or None.
     """
     if not text:
         return None
 
-    # strip code fences
-    text = re.sub(r"```(?:json)?", "", text, flags=re.IGNORECASE).strip()
+    # strip code fences (plain /api/generate output usually has none)
+    if "```" in text:
+        text = _FENCE_RE.sub("", text)
 
-    # find earliest '{' or '['
-    obj_start = text.find("{")
-    arr_start = text.find("[")
-    starts = [x for x in (obj_start, arr_start) if x != -1]
-    if not starts:
+    # find earliest '{' or '[' in one pass
+    m = _JSON_START_RE.search(text)
+    if m is None:
         return None
-    start = min(starts)
+    start = m.start()
 
-    candidate = text[start:]
-
-    # try direct parse
+    # single balanced-bracket scan, then one parse of the span
+    end = _find_json_span(text, start)
+    if end == -1:
+        return None
     try:
-        json.loads(candidate)
-        return candidate
+        return _loads(text[start:end + 1])
     except Exception:
-        pass
-
-    # try trimming end
-    for i in range(len(candidate), max(len(candidate) - 12000, 0), -1):
-        sub = candidate[:i].strip()
-        try:
-            json.loads(sub)
-            return sub
-        except Exception:
-            continue
-
-    return None
+        return None
 
 
 def _safe_json_loads(text: str) -> Optional[Any]:
+    # Replies produced with format=json parse directly; the extraction scan is only
+    # the fallback for free-form output (prose, code fences).
     try:
-        return json.loads(text)
+        return _loads(text)
     except Exception:
-        j = _extract_json_object(text)
-        if j is None:
-            return None
-        try:
-            return json.loads(j)
-        except Exception:
-            return None
+        return _extract_json_value(text)
 
 
-@dataclass
-class LLMConfig:
-    mode: str = "none"  # none|ollama
-    model: str = "phi3:mini"
-    base_url: str = "http://localhost:11434"
-    timeout: int = 120
+# bump when prompts or reply handling change, so cached replies are not reused
+_PROMPT_VERSION = "3"
 
 
-class NoneLLM:
+class _ResponseCache:
     """
-    Graceful fallback LLM:
-    - extract_items returns empty
-    - summarize returns a short placeholder manager_summary
+    On-disk cache of raw LLM replies (sqlite, stdlib only).
+    One connection guarded by a lock, so extract_items_iter workers can share it.
     """
-    def extract_items(self, chunk_text: str, source: str) -> Dict[str, Any]:
-        return {"items": []}
+    def __init__(self, path: str, ttl: int):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def key(payload: Dict[str, Any]) -> str:
+        blob = _PROMPT_VERSION + "\x00" + json.dumps(payload, sort_keys=True, ensure_ascii=False)
+        return hashlib.blake2b(blob.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        # a locked or corrupt cache file is a miss: the cache must never fail extraction
+        try:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT value FROM responses WHERE key = ? AND expires > ?", (key, time.time())
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
 
-    def summarize(self, items: List[dict]) -> Dict[str, Any]:
-        return {
-            "manager_summary": [
-                "LLM is disabled or unavailable.",
-                "Report contains all extracted items sorted by deterministic priority policy.",
-                "Run with --llm ollama to generate a manager summary (no API keys required).",
-            ]
-        }
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
 
+    def set(self, key: str, value: str) -> None:
+        # best effort: a failed write only means the next run asks the model again
+        try:
+            with self._lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, expires) VALUES (?, ?, ?)",
+                    (key, value, time.time() + self.ttl),
+                )
+                self._db.commit()
+        except sqlite3.Error:
+            pass
+
+
+def _open_cache(path: Optional[str], ttl: int) -> Optional[_ResponseCache]:
+    if not path:
+        return None
+    try:
+        return _ResponseCache(path, ttl)
+    except sqlite3.Error:
+        return None  # unwritable location: run uncached
 
-class OllamaLLM:
+
+class _RateLimiter:
     """
-    Uses Ollama /api/generate (works even when /api/chat is not available).
+    At most `rpm` calls in any 60 s window, shared by every thread that calls acquire().
+    Keeps a sliding log of recent call times; a caller over budget sleeps (without the lock) until the oldest expires, then retries.
     """
-    def __init__(self, cfg: LLMConfig):
-        self.cfg = cfg
 
-    def _generate(self, prompt: str) -> str:
-        payload = {
-            "model": self.cfg.model,
-            "prompt": (
-                "SYSTEM: You are a precise assistant. Return ONLY valid JSON. Do not add extra keys.\n\n"
-                f"USER:\n{prompt}\n"
-            ),
-            "stream": False,
-            "options": {"temperature": 0.1},
-        }
-        r = requests.post(f"{self.cfg.base_url}/api/generate", json=payload, timeout=self.cfg.timeout)
-        r.raise_for_status()
-        data = r.json()
-        return data.get("response", "")
+    def __init__(self, rpm: int):
+        self.rpm = rpm
+        self._calls: Deque[float] = deque()
+        self._lock = threading.Lock()
 
-    def extract_items(self, chunk_text: str, source: str) -> Dict[str, Any]:
-        prompt = f"""
-Extract operational updates from the text.
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= 60.0:
+                    self._calls.popleft()
+                if len(self._calls) < self.rpm:
+                    self._calls.append(now)
+                    return
+                wait = 60.0 - (now - self._calls[0])
+            # sleep outside the lock, then re-check: another thread may have taken the freed slot
+            time.sleep(max(0.0, wait))
 
-Return ONLY JSON in this exact format:
-{{
-  "items": [
-    {{
-      "type":"done|blocker|risk|decision|question|info",
-      "priority":"P0|P1|P2",
-      "channel":"email|slack|standup|doc",
-      "text":"...",
-      "owner":null,
-      "due":null,
-      "flags": {{
-        "requires_action": true|false,
-        "manager_attention": true|false,
-        "financial_risk": true|false,
-        "blocking": true|false,
-        "informational": true|false
-      }},
-      "source":"{source}"
-    }}
-  ]
-}}
 
-Rules:
+_LIMITERS: Dict[Tuple[str, int], _RateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def _rate_limiter(base_url: str, rpm: int) -> Optional[_RateLimiter]:
+    """One limiter per Ollama URL, shared by every client in the process (extract + summarize)."""
+    if rpm <= 0:
+        return None
+    with _LIMITERS_LOCK:
+        lim = _LIMITERS.get((base_url, rpm))
+        if lim is None:
+            lim = _LIMITERS[(base_url, rpm)] = _RateLimiter(rpm)
+        return lim
+
+
+# Item rules shared by the single-chunk and batched extraction prompts.
+_ITEM_RULES = """
 - Keep each item short (<= 200 chars).
 - priority:
   - P0: money mismatch, incident/outage, compliance breach, "pause now", urgent escalation
@@ -160,42 +305,105 @@ Rules:
   - informational: purely FYI
 - If owner is mentioned, set "owner" (name/role). Otherwise null.
 - If a due date is mentioned, set "due" as YYYY-MM-DD. Otherwise null.
-- ALWAYS set source exactly to "{source}" for every item.
-- Do NOT invent facts. If nothing found, return {{ "items": [] }}.
+""".strip()
 
-TEXT:
-{chunk_text}
+
+# Prompt templates, rendered once at import; per call only %-substitution is left.
+# Everything that varies per call (source, text) sits at the very end, so the long
+# instruction prefix is identical across calls and Ollama can reuse its cached KV state
+# for it instead of prefilling it again.
+_SYSTEM_PREFIX = "SYSTEM: You are a precise assistant. Return ONLY valid JSON. Do not add extra keys.\n\nUSER:\n"
+
+_ITEM_SCHEMA = """
+{
+  "type":"done|blocker|risk|decision|question|info",
+  "priority":"P0|P1|P2",
+  "channel":"email|slack|standup|doc",
+  "text":"...",
+  "owner":null,
+  "due":null,
+  "flags": {
+    "requires_action": true|false,
+    "manager_attention": true|false,
+    "financial_risk": true|false,
+    "blocking": true|false,
+    "informational": true|false
+  }%s
+}
 """.strip()
 
-        raw = self._generate(prompt)
-        parsed = _safe_json_loads(raw)
-        if not isinstance(parsed, dict) or "items" not in parsed or not isinstance(parsed["items"], list):
-            return {"items": []}
 
-        out_items: List[Dict[str, Any]] = []
-        for it in parsed["items"]:
-            if not isinstance(it, dict):
-                continue
-            it["source"] = source  # enforce
-            if "type" not in it or "text" not in it:
-                continue
-            out_items.append(it)
+def _indent(block: str, n: int) -> str:
+    pad = " " * n
+    return "\n".join(pad + line for line in block.splitlines())
 
-        return {"items": out_items}
 
-    def summarize(self, items: List[dict]) -> Dict[str, Any]:
-        """
-        Only manager_summary. Priority & grouping are deterministic in main.py.
-        """
-        items_json = json.dumps(items, ensure_ascii=False, indent=2)
+_EXTRACT_TMPL = """
+Extract operational updates from the text.
+
+Return ONLY JSON in this exact format:
+{
+  "items": [
+%(schema)s
+  ]
+}
 
-        prompt = f"""
+Rules:
+%(rules)s
+- ALWAYS set source exactly to the SOURCE value below for every item.
+- Do NOT invent facts. If nothing found, return { "items": [] }.
+
+SOURCE: %%(source)s
+
+TEXT:
+%%(text)s
+""".strip() % {
+    "schema": _indent(_ITEM_SCHEMA % ',\n  "source":"<SOURCE>"', 4),
+    "rules": _ITEM_RULES,
+}
+
+_BATCH_TMPL = """
+Extract operational updates from each of the chunks below.
+
+Return ONLY JSON in this exact format:
+{
+  "results": [
+    {
+      "chunk":<number from the chunk header>,
+      "items": [
+%(schema)s
+      ]
+    }
+  ]
+}
+
+Rules:
+- Return exactly one entry in "results" per chunk, in chunk order, with "chunk" set to the number in the chunk header.
+%(rules)s
+- Do NOT invent facts. A chunk with nothing to report gets "items": [].
+
+CHUNKS (%%(n)d):
+%%(chunks)s
+""".strip() % {
+    "schema": _indent(_ITEM_SCHEMA % "", 8),
+    "rules": _ITEM_RULES,
+}
+
+# JSON replies never need a run of blank lines; stop decoding there. Under format=json a
+# code fence can only open junk after the object, but free-form replies often wrap the JSON
+# in one (_safe_json_loads strips it), so "```" is a stop only when json_format is set.
+_EXTRACT_STOP = ["\n\n\n"]
+_EXTRACT_STOP_JSON = _EXTRACT_STOP + ["```"]
+
+_SUMMARY_FIELDS = ("type", "priority", "text", "owner", "due")
+
+_SUMMARIZE_TMPL = """
 You will receive extracted operational items as a JSON array.
 Return ONLY JSON in this exact format:
 
-{{
+{
   "manager_summary": ["bullet 1", "bullet 2", "bullet 3", "bullet 4", "bullet 5"]
-}}
+}
 
 Rules:
 - 5–8 bullets max, concise and manager-ready.
@@ -203,17 +411,471 @@ Rules:
 - Do NOT hallucinate: only summarize what's in ITEMS.
 
 ITEMS:
-{items_json}
+%s
 """.strip()
 
-        raw = self._generate(prompt)
+
+_ITEM_TYPES = frozenset(("done", "blocker", "risk", "decision", "question", "info"))
+_OPTIONAL_STR_FIELDS = ("priority", "channel", "owner", "due")
+
+
+def _coerce_str(v: Any) -> Optional[str]:
+    """An optional string field as the model sent it, or None when it has no sensible string form."""
+    if v is None or isinstance(v, str):
+        return v
+    if isinstance(v, (int, float)) and not isinstance(v, bool):
+        return str(v)  # e.g. a numeric due
+    if isinstance(v, list) and v and all(isinstance(x, str) for x in v):
+        return ", ".join(x.strip() for x in v)  # e.g. two owners
+    return None
+
+
+def _valid_item(it: Any) -> bool:
+    """
+    Structural check of one extracted item against the prompt schema. Only an item
+    without usable text is dropped; off-schema fields are coerced in place instead
+    (unknown type -> "info", a bad optional field -> a string or None), so
+    sanitize_item in main.py still sees every actionable item.
+    """
+    if not isinstance(it, dict):
+        return False
+    text = it.get("text")
+    if not isinstance(text, str) or not text.strip():
+        return False
+    t = it.get("type")
+    if t is not None and (not isinstance(t, str) or t.strip().lower() not in _ITEM_TYPES):
+        it["type"] = "info"
+    for k in _OPTIONAL_STR_FIELDS:
+        v = it.get(k)
+        if v is not None and not isinstance(v, str):
+            it[k] = _coerce_str(v)
+    if it.get("flags") is not None and not isinstance(it["flags"], dict):
+        it["flags"] = None
+    return True
+
+
+def _clean_items(raw_items: Any, source: str) -> List[Dict[str, Any]]:
+    out_items: List[Dict[str, Any]] = []
+    if not isinstance(raw_items, list):
+        return out_items
+    for it in raw_items:
+        if not _valid_item(it):
+            continue
+        it["source"] = source  # enforce
+        out_items.append(it)
+    return out_items
+
+
+def _unique_chunks(pairs: List[Tuple[str, str]]) -> Tuple[List[Tuple[str, str]], List[int]]:
+    """
+    Collapse (chunk_text, source) pairs with identical text.
+    Returns the unique pairs (first source wins) and, per input pair, its index into them.
+    """
+    index: Dict[str, int] = {}
+    unique: List[Tuple[str, str]] = []
+    order: List[int] = []
+    for text, source in pairs:
+        j = index.get(text)
+        if j is None:
+            j = index[text] = len(unique)
+            unique.append((text, source))
+        order.append(j)
+    return unique, order
+
+
+def _restamp(res: Any, from_source: str, source: str) -> Any:
+    """A unique chunk's result as seen by another occurrence of the same text."""
+    if isinstance(res, Exception) or from_source == source:
+        return res
+    return {"items": [dict(it, source=source) for it in (res.get("items") or [])]}
+
+
+@dataclass
+class LLMConfig:
+    mode: str = "none"  # none|ollama
+    model: str = "phi3:mini"
+    base_url: str = "http://localhost:11434"
+    # several Ollama instances (e.g. one per CPU socket); calls are spread round-robin
+    base_urls: List[str] = field(default_factory=list)
+    timeout: int = 120
+    concurrency: Optional[int] = None  # hard cap on in-flight LLM calls; None = 2 per Ollama URL
+    rpm: int = 0  # max LLM calls per minute per Ollama URL; 0 = unlimited
+    cache_path: Optional[str] = None  # sqlite file for per-chunk items + summary replies; None disables (main.py passes <output>/.llm_cache.sqlite)
+    cache_ttl: int = 7 * 86400
+    extract_num_predict: int = 1024  # decode budget per extracted chunk
+    summarize_num_predict: int = 512
+    keep_alive: Optional[str] = "10m"  # keep the model (and its prompt cache) loaded between calls
+    json_format: Optional[str] = "json"  # Ollama "format"; None sends free-form prompts
+    max_chunk_chars: int = 6000  # longer chunk text is clipped before prompting
+    batch_max_chars: int = 4000  # total chunk text packed into one extract_items_iter batch prompt
+    retries: int = 2  # extra attempts per call after a timeout, dropped connection or 429/5xx
+    retry_backoff: float = 1.0  # first retry waits 1-2x this many seconds, doubling per attempt
+    # cap on one whole streamed reply per extract_num_predict tokens requested (a batch of k
+    # chunks gets k times this); never below timeout, which only bounds each read
+    reply_timeout: int = 45
+
+
+# Placeholder summary, built once; shared, so callers must not mutate it.
+_NONE_SUMMARY: Dict[str, Any] = {
+    "manager_summary": [
+        "LLM is disabled or unavailable.",
+        "Report contains all extracted items sorted by deterministic priority policy.",
+        "Run with --llm ollama to generate a manager summary (no API keys required).",
+    ]
+}
+
+
+class NoneLLM:
+    """
+    Graceful fallback LLM:
+    - extract_items returns empty
+    - summarize returns a short placeholder manager_summary
+    """
+    def extract_items(self, chunk_text: str, source: str) -> Dict[str, Any]:
+        return {"items": []}
+
+    def extract_items_iter(self, pairs: List[Tuple[str, str]], k: int = 1, small_chars: Optional[int] = None) -> Iterator[Tuple[int, Any]]:
+        for i, (c, s) in enumerate(pairs):
+            yield i, self.extract_items(c, s)
+
+    def summarize(self, items: List[dict]) -> Dict[str, Any]:
+        return _NONE_SUMMARY
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "NoneLLM":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class OllamaLLM:
+    """
+    Uses Ollama /api/generate (works even when /api/chat is not available).
+    """
+    def __init__(self, cfg: LLMConfig, session: Optional[requests.Session] = None):
+        self.cfg = cfg
+        self.base_urls = list(cfg.base_urls) or [cfg.base_url]
+        self._url_cycle = itertools.cycle(self.base_urls)
+        self._url_lock = threading.Lock()
+        # the cap is exact (1 = strictly one call at a time); by default two in flight per
+        # endpoint, so every instance stays busy
+        if cfg.concurrency is None:
+            self.workers = 2 * len(self.base_urls)
+        else:
+            self.workers = max(1, cfg.concurrency)
+        self._owns_session = session is None and self.workers > _SESSION_POOL_SIZE
+        if session is not None:
+            self.session = session
+        elif self._owns_session:
+            # a pool smaller than the worker count makes urllib3 drop and reopen connections
+            self.session = _new_session(self.workers)
+        else:
+            self.session = _SESSION
+        self.cache = _open_cache(cfg.cache_path, cfg.cache_ttl)
+        self._extract_stop = _EXTRACT_STOP_JSON if cfg.json_format else _EXTRACT_STOP
+        self._limiters = {u: _rate_limiter(u, cfg.rpm) for u in self.base_urls}
+
+    def close(self) -> None:
+        """Release the connection pool (if owned) and the reply cache."""
+        if self._owns_session:
+            self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+
+    def __enter__(self) -> "OllamaLLM":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _next_url(self) -> str:
+        with self._url_lock:
+            return next(self._url_cycle)
+
+    def _generate(
+        self, prompt: str, num_predict: Optional[int] = None, stop: Optional[List[str]] = None,
+        cache_reply: bool = True,
+    ) -> Tuple[str, Optional[str]]:
+        """
+        (reply text, cache key). Nothing is cached here: the caller passes the key to
+        _remember once the reply has parsed into the shape it expects. The key is None
+        when the reply came from the cache or caching is off.
+        cache_reply=False skips the reply cache entirely (extraction caches items per chunk instead).
+        """
+        options: Dict[str, Any] = {"temperature": 0.1}
+        if num_predict:
+            options["num_predict"] = num_predict
+        if stop:
+            options["stop"] = stop
+        payload = {
+            "model": self.cfg.model,
+            "prompt": _SYSTEM_PREFIX + prompt + "\n",
+            "stream": True,
+            "options": options,
+        }
+        if self.cfg.keep_alive:
+            payload["keep_alive"] = self.cfg.keep_alive
+        if self.cfg.json_format:
+            # constrained decoding: the server only samples tokens that keep the output valid JSON
+            payload["format"] = self.cfg.json_format
+
+        key = None
+        if self.cache is not None and cache_reply:
+            key = _ResponseCache.key({k: v for k, v in payload.items() if k not in ("stream", "keep_alive")})
+            hit = self.cache.get(key)
+            if hit is not None:
+                return hit, None
+
+        body = _dumps(payload).encode("utf-8")
+        reply_cap = self._reply_cap(num_predict)
+        retries = max(0, self.cfg.retries)
+        for attempt in range(retries + 1):
+            try:
+                raw = self._stream(body, reply_cap)
+                break
+            except Exception as e:
+                if attempt == retries or not _is_transient(e):
+                    raise
+                # jittered exponential backoff; the retry also moves on to the next url
+                time.sleep(self.cfg.retry_backoff * (2 ** attempt) * (1 + random.random()))
+        return raw, key
+
+    def _remember(self, key: Optional[str], raw: str) -> None:
+        # only replies that survived validation: a truncated one would be replayed for the whole TTL
+        if key is not None and self.cache is not None:
+            self.cache.set(key, raw)
+
+    def _reply_cap(self, num_predict: Optional[int]) -> float:
+        # seconds one whole reply may take: scales with the decode budget, so a packed
+        # batch prompt gets as long per chunk as a single extract call
+        scale = max(1.0, (num_predict or 0) / max(1, self.cfg.extract_num_predict))
+        return max(float(self.cfg.timeout), self.cfg.reply_timeout * scale)
+
+    def _stream(self, body: bytes, reply_cap: float) -> str:
+        # Stream NDJSON deltas and hang up as soon as the top-level object closes,
+        # so the server stops decoding instead of generating a tail we would discard.
+        buf: List[str] = []
+        tracker = _JsonCloseTracker()
+        url = self._next_url()
+        limiter = self._limiters.get(url)
+        if limiter is not None:
+            limiter.acquire()
+        # with stream=True requests' timeout only bounds each read, so a server that keeps
+        # trickling tokens could hold the call forever; reply_cap bounds the whole reply
+        deadline = time.monotonic() + reply_cap
+        with self.session.post(f"{url}/api/generate", data=body, headers=_JSON_HEADERS, timeout=self.cfg.timeout, stream=True) as r:
+            r.raise_for_status()
+            for line in r.iter_lines():
+                if not line:
+                    continue
+                data = _loads(line)  # raw bytes: orjson parses them without a decode
+                delta = data.get("response", "")
+                end = tracker.feed(delta)
+                if end != -1:
+                    buf.append(delta[:end + 1])
+                    break
+                buf.append(delta)
+                if data.get("done"):
+                    break
+                if time.monotonic() > deadline:
+                    raise _ReplyDeadline(f"{url}: no complete reply within {reply_cap:g}s")
+        return "".join(buf)
+
+    def _items_key(self, chunk_text: str) -> str:
+        # items depend on the chunk text only, not on its source label, so runs that
+        # renumber chunks (or repeat a chunk elsewhere) still hit
+        return _ResponseCache.key({
+            "kind": "items",
+            "model": self.cfg.model,
+            "text": chunk_text,
+            "num_predict": self.cfg.extract_num_predict,
+            "format": self.cfg.json_format,
+        })
+
+    def _cached_items(self, chunk_text: str, source: str) -> Optional[Dict[str, Any]]:
+        if self.cache is None:
+            return None
+        hit = self.cache.get(self._items_key(chunk_text))
+        if hit is None:
+            return None
+        try:
+            return {"items": [dict(it, source=source) for it in _loads(hit)]}
+        except Exception:
+            return None  # unreadable entry: treat as a miss and extract again
+
+    def _store_items(self, chunk_text: str, items: List[Dict[str, Any]]) -> None:
+        if self.cache is not None:
+            slim = [{k: v for k, v in it.items() if k != "source"} for it in items]
+            self.cache.set(self._items_key(chunk_text), _dumps(slim))
+
+    def extract_items(self, chunk_text: str, source: str) -> Dict[str, Any]:
+        hit = self._cached_items(chunk_text, source)
+        if hit is not None:
+            return hit
+
+        text = chunk_text
+        if len(text) > self.cfg.max_chunk_chars:
+            # prefill cost grows with prompt length; bound it for pathological chunks
+            text = text[:self.cfg.max_chunk_chars] + "\n...[truncated]"
+        prompt = (_EXTRACT_TMPL % {"source": source, "text": text}).rstrip()
+
+        # the validated items are cached per chunk text below; caching the reply too would
+        # only cost a second sqlite write per chunk
+        raw, _ = self._generate(prompt, num_predict=self.cfg.extract_num_predict, stop=self._extract_stop, cache_reply=False)
+        parsed = _safe_json_loads(raw)
+        if not isinstance(parsed, dict) or "items" not in parsed or not isinstance(parsed["items"], list):
+            return {"items": []}
+
+        items = _clean_items(parsed["items"], source)
+        self._store_items(chunk_text, items)
+        return {"items": items}
+
+    def extract_items_iter(self, pairs: List[Tuple[str, str]], k: int = 1, small_chars: Optional[int] = None) -> Iterator[Tuple[int, Any]]:
+        """
+        Run extract_items over (chunk_text, source) pairs on a bounded thread pool and
+        yield (index into pairs, result) as each call finishes, in completion order, so
+        callers can start on early results while slower chunks are still decoding.
+        A failed call yields its exception instead of a dict; identical chunks are sent
+        to the model once and their result is yielded for every occurrence.
+        With k > 1, uncached chunks shorter than small_chars (default: any that fit
+        cfg.batch_max_chars) are packed up to k per prompt, so the instruction preamble is
+        sent and prefilled once per group; cached chunks never take a seat in a batch.
+        """
+        unique, order = _unique_chunks(pairs)
+        if not unique:
+            return
+        users: List[List[int]] = [[] for _ in unique]
+        for i, j in enumerate(order):
+            users[j].append(i)
+
+        todo = list(range(len(unique)))
+        if k > 1:
+            cached = [self._cached_items(text, source) for text, source in unique]
+            for j, res in enumerate(cached):
+                if res is not None:
+                    for i in users[j]:
+                        yield i, _restamp(res, unique[j][1], pairs[i][1])
+            todo = [j for j, res in enumerate(cached) if res is None]
+        todo_pairs = [unique[j] for j in todo]
+        groups = [[todo[g] for g in idx] for idx in self._batch_groups(todo_pairs, k, small_chars)]
+
+        def one(idx: List[int]) -> Tuple[List[int], List[Any]]:
+            try:
+                return idx, self._run_group([unique[j] for j in idx])
+            except Exception as e:
+                return idx, [e] * len(idx)
+
+        if not groups:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(groups))) as ex:
+            for fut in as_completed([ex.submit(one, idx) for idx in groups]):
+                idx, res = fut.result()
+                for j, r in zip(idx, res):
+                    for i in users[j]:
+                        yield i, _restamp(r, unique[j][1], pairs[i][1])
+
+    def _extract_group(self, group: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        chunks_txt = "\n".join(
+            f"--- CHUNK {i} ---\n{text}" for i, (text, _) in enumerate(group, 1)
+        )
+        prompt = (_BATCH_TMPL % {"n": len(group), "chunks": chunks_txt}).rstrip()
+
+        raw, _ = self._generate(
+            prompt, num_predict=self.cfg.extract_num_predict * len(group), stop=self._extract_stop, cache_reply=False
+        )
+        parsed = _safe_json_loads(raw)
+        results = parsed.get("results") if isinstance(parsed, dict) else None
+        if not isinstance(results, list):
+            results = []
+
+        # map entries back by chunk position: source labels are not unique (same basename
+        # in two dirs, two slack events with the same [hh:mm] Name). A number claimed twice
+        # is ambiguous and goes back to the per-chunk path, so it is never cached.
+        by_index: Dict[int, Any] = {}
+        seen: set = set()
+        for r in results:
+            n = r.get("chunk") if isinstance(r, dict) else None
+            if isinstance(n, int) and not isinstance(n, bool) and isinstance(r.get("items"), list):
+                if n in seen:
+                    by_index.pop(n, None)
+                else:
+                    seen.add(n)
+                    by_index[n] = r.get("items")
+
+        out: List[Dict[str, Any]] = []
+        for i, (text, source) in enumerate(group, 1):
+            if i in by_index:
+                items = _clean_items(by_index[i], source)
+                self._store_items(text, items)
+                out.append({"items": items})
+            else:
+                # reply could not be split back for this chunk: ask for it alone
+                out.append(self.extract_items(text, source))
+        return out
+
+    def _batch_groups(self, pairs: List[Tuple[str, str]], k: int, small_chars: Optional[int] = None) -> List[List[int]]:
+        """
+        Consecutive runs of up to k pair indexes whose text totals at most
+        cfg.batch_max_chars; chunks not shorter than small_chars go alone.
+        """
+        limit = self.cfg.batch_max_chars if small_chars is None else min(small_chars - 1, self.cfg.batch_max_chars)
+        groups: List[List[int]] = []
+        cur: List[int] = []
+        cur_chars = 0
+        for i, (text, _) in enumerate(pairs):
+            n = len(text)
+            if k <= 1 or n > limit:
+                groups.append([i])
+                continue
+            if cur and (len(cur) >= k or cur_chars + n > self.cfg.batch_max_chars):
+                groups.append(cur)
+                cur, cur_chars = [], 0
+            cur.append(i)
+            cur_chars += n
+        if cur:
+            groups.append(cur)
+        return groups
+
+    def _run_group(self, group: List[Tuple[str, str]]) -> List[Any]:
+        if len(group) == 1:
+            return [self.extract_items(*group[0])]
+        try:
+            return self._extract_group(group)
+        except Exception:
+            # a failed packed call (e.g. over its reply cap) must not drop all k chunks:
+            # ask for each alone, so only the chunks that fail on their own are lost
+            out: List[Any] = []
+            for text, source in group:
+                try:
+                    out.append(self.extract_items(text, source))
+                except Exception as e:
+                    out.append(e)
+            return out
+
+    def summarize(self, items: List[dict]) -> Dict[str, Any]:
+        """
+        Only manager_summary. Priority & grouping are deterministic in main.py.
+        A reply that does not parse gives {}, so callers keep their own fallback.
+        """
+        # compact, and only the fields the summary uses: prompt tokens drive prefill time
+        slim = [{k: it[k] for k in _SUMMARY_FIELDS if k in it} for it in items if isinstance(it, dict)]
+        items_json = _dumps(slim)
+        prompt = (_SUMMARIZE_TMPL % items_json).rstrip()
+
+        raw, key = self._generate(prompt, num_predict=self.cfg.summarize_num_predict)
         parsed = _safe_json_loads(raw)
         if not isinstance(parsed, dict) or "manager_summary" not in parsed or not isinstance(parsed["manager_summary"], list):
-            return NoneLLM().summarize(items)
+            return {}
 
         bullets: List[str] = []
         for x in parsed.get("manager_summary", []):
             if isinstance(x, str) and x.strip():
                 bullets.append(x.strip())
 
+        if bullets:
+            self._remember(key, raw)
         return {"manager_summary": bullets}
\ No newline at end of file
@@ -7,18 +7,36 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import mmap
+import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache, partial
+from itertools import chain
+from operator import attrgetter
 from pathlib import Path
-from typing import List, Any, Dict, Tuple, Optional, DefaultDict
+from typing import List, Any, Callable, Dict, Tuple, Optional, DefaultDict, Iterable, Iterator
 from collections import defaultdict
 
-from jinja2 import Template
+from jinja2 import DictLoader, Environment, FileSystemBytecodeCache
+
+try:  # optional: much faster indented dumps for the debug/report JSON files
+    import orjson
+
+    def _json_bytes(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    def _json_bytes(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
 
 from llm import LLMConfig, NoneLLM, OllamaLLM, ollama_is_available
 
 SUPPORTED_EXTS = {".txt", ".md", ".json"}
+MMAP_MIN_BYTES = 1 << 20  # .txt/.md at least this big are mmap'd instead of read()
 APP_TITLE = "TaskDigest"
 
 # -------------------------
@@ -36,16 +54,45 @@ SECTION_LABELS = {
     "RISKS": "RISKS:",
     "QUESTIONS": "QUESTIONS:",
 }
+_HEADER_TO_KEY = {header.upper(): k for k, header in SECTION_LABELS.items()}
+_BULLET_PREFIXES = ("- ", "• ")
 
 # Optional markdown standup fallback
 STANDUP_MD_HEADER_RE = re.compile(r"^#\s*Daily Standup\s*[–-]\s*.+$", flags=re.MULTILINE)
 STANDUP_MD_TITLE_RE = re.compile(r"^#\s*Daily Standup\s*[–-]\s*(.+?)\s*$", flags=re.MULTILINE)
+STANDUP_MD_SPLIT_RE = re.compile(r"(?=^#\s*Daily Standup\s*[–-]\s*)", flags=re.MULTILINE)
+# either header in one scan; lastgroup tells which one matched first
+STANDUP_ANY_HEADER_RE = re.compile(
+    r"(?P<plain>^\s*STANDUP:\s*.+?\s*$)|(?P<md>^#\s*Daily Standup\s*[–-]\s*.+$)",
+    flags=re.MULTILINE,
+)
+STANDUP_MD_SECTION_TITLES = {
+    "DONE": "Done",
+    "IN_PROGRESS": "In Progress",
+    "BLOCKERS": "Blockers",
+    "RISKS": "Risks / Concerns",
+    "QUESTIONS": "Questions",
+}
+STANDUP_MD_SECTION_RES = {
+    key: re.compile(rf"^##\s*{re.escape(title)}\s*\n(.*?)(?=^##\s*|\Z)", flags=re.MULTILINE | re.DOTALL)
+    for key, title in STANDUP_MD_SECTION_TITLES.items()
+}
+
+# Split slack/email logs with a plain line walk; False falls back to the split regexes below
+LINE_SPLIT_EVENTS = True
 
 # -------------------------
 # Slack parsing
 # -------------------------
 SLACK_EVENT_SPLIT_RE = re.compile(r"^\s*---\s*$", flags=re.MULTILINE)
 SLACK_ROOT_RE = re.compile(r"^\[(\d{2}:\d{2})\]\s*([^:]+?):\s*(.*)\s*$")
+# SLACK_ROOT_RE applied per line over a whole block: first line not indented with space/tab
+SLACK_ROOT_LINE_RE = re.compile(
+    r"^(?![ \t])[^\S\n]*\[(\d{2}:\d{2})\][^\S\n]*([^:\n]+?):[^\S\n]*(.*)$",
+    flags=re.MULTILINE,
+)
+# line breaks str.splitlines() splits on but ^/$ don't; blocks containing them take the per-line scan
+SPLITLINES_ONLY_BREAKS_RE = re.compile("[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
 
 # -------------------------
 # Email parsing
@@ -53,31 +100,52 @@ SLACK_ROOT_RE = re.compile(r"^\[(\d{2}:\d{2})\]\s*([^:]+?):\s*(.*)\s*$")
 EMAIL_SUBJECT_RE = re.compile(r"^\s*Subject:\s*(.+?)\s*$", flags=re.MULTILINE)
 EMAIL_SPLIT_RE = re.compile(r"(?=^\s*Subject:\s*)", flags=re.MULTILINE)
 EMAIL_FROM_RE = re.compile(r"^\s*From:\s*(.+?)\s*$", flags=re.MULTILINE)
+EMAIL_FROM_STRIP_RE = re.compile(r"^\s*From:.*\n?", flags=re.MULTILINE)
 
 # Priority policy helpers
 URGENT_RE = re.compile(r"\burgent\b|\beod\b|\bdeadline\b|\btoday\b", re.IGNORECASE)
 
 
+def _any_of_re(*keywords: str) -> re.Pattern:
+    # plain substring alternation (no \b): same hits as any(k in text for k in keywords)
+    return re.compile("|".join(re.escape(k) for k in keywords))
+
+
+FINANCIAL_RE = _any_of_re("aed", "usd", "payment", "payout", "settlement", "ledger", "chargeback", "refund", "batch", "merchant")
+REQUIRES_ACTION_RE = _any_of_re("confirm", "investigate", "review", "pause", "escalate", "fix", "follow up", "need a quick review", "ok to", "who owns")
+NO_ACCESS_RE = _any_of_re("no production access", "no access", "cannot access", "can't access", "unable to access", "no dashboard")
+MISMATCH_RE = _any_of_re("mismatch", "difference", "reconcile", "reconciliation", "ledger totals", "missing-row", "doesn't match", "does not match")
+PAYMENTS_CORE_RE = _any_of_re("settlement", "ledger", "payout", "merchant", "batch")
+FRAUDISH_RE = _any_of_re("abnormal", "suspicious", "fraud", "abuse", "incentive", "affiliate", "chargeback spike", "chargeback spikes")
+SLA_RE = _any_of_re("latency", "spiking", "sla", "response times")
+PLANNING_RE = _any_of_re("ui copy", "final qa", "move release", "release to friday", "planning", "fee breakdown", "proposal")
+
+
 # -------------------------
 # Helpers
 # -------------------------
+WS_RUN_RE = re.compile(r"\s+")
+SLUG_SEP_RE = re.compile(r"[^a-z0-9]+")
+NON_WORD_RE = re.compile(r"[^\w]+")
+
+
 def _slug(s: str) -> str:
     s = (s or "").strip()
-    s = re.sub(r"\s+", " ", s)
+    s = WS_RUN_RE.sub(" ", s)
     s = s.strip()
     # keep original case for slack name? user wants Nadia exactly; but safe to preserve.
     # For slug parts (team), use lowercase underscores.
     sl = s.lower()
-    sl = re.sub(r"[^a-z0-9]+", "_", sl)
-    sl = re.sub(r"_+", "_", sl).strip("_")
+    # "_" is itself a separator, so one pass already leaves no "__" runs
+    sl = SLUG_SEP_RE.sub("_", sl).strip("_")
     return sl or "unknown"
 
 
 def _name_token(name: str) -> str:
     # keep original-ish but no spaces
     n = (name or "").strip()
-    n = re.sub(r"\s+", "_", n)
-    n = re.sub(r"[^\w]+", "", n)  # keep letters/digits/underscore
+    n = WS_RUN_RE.sub("_", n)
+    n = NON_WORD_RE.sub("", n)  # keep letters/digits/underscore
     return n or "Unknown"
 
 
@@ -92,15 +160,37 @@ def slack_src(time_hm: str, name: str) -> str:
 
 def email_src(subject: str) -> str:
     # keep subject human-readable as requested, but normalize whitespace/newlines
-    s = re.sub(r"\s+", " ", (subject or "").strip())
+    s = WS_RUN_RE.sub(" ", (subject or "").strip())
     return f"email_{s}" if s else "email_no_subject"
 
 
+class _NormTable(dict):
+    """
+    str.translate table that deletes everything except word chars, whitespace and ":+#-".
+    Filled lazily on first sight of each code point, so non-ASCII text costs one lookup per new char.
+    """
+
+    def __missing__(self, cp: int) -> Optional[int]:
+        c = chr(cp)
+        keep = c.isalnum() or c.isspace() or c in "_:+#-"
+        self[cp] = cp if keep else None
+        return self[cp]
+
+
+_NORM_TABLE = _NormTable()
+
+
+@lru_cache(maxsize=8192)
+def _norm_for_dedupe_cached(s: str) -> str:
+    # collapse whitespace first, then drop punctuation (same order as the old re.sub pair)
+    return " ".join(s.lower().split()).translate(_NORM_TABLE)
+
+
 def _norm_for_dedupe(s: str) -> str:
-    s = (s or "").lower().strip()
-    s = re.sub(r"\s+", " ", s)
-    s = re.sub(r"[^\w\s:+#-]", "", s)
-    return s
+    # the same note text is normalized by several aggregation paths
+    if not s:
+        return ""
+    return _norm_for_dedupe_cached(s)
 
 
 def _join_bullets(bullets: List[str], max_items: int = 5) -> str:
@@ -116,13 +206,11 @@ def _bullets_from_lines(lines: List[str]) -> List[str]:
     out: List[str] = []
     for raw in lines:
         s = raw.strip()
-        if not s:
-            continue
-        if s.startswith("- "):
-            out.append(s[2:].strip())
-        elif s.startswith("• "):
-            out.append(s[2:].strip())
-    return [x for x in out if x]
+        if s.startswith(_BULLET_PREFIXES):
+            v = s[2:].strip()
+            if v:
+                out.append(v)
+    return out
 
 
 def _keep_text(x: str) -> bool:
@@ -133,72 +221,171 @@ def _keep_text(x: str) -> bool:
 # -------------------------
 # IO
 # -------------------------
+def _iter_files(root: Path) -> Iterator[Tuple[str, str]]:
+    """
+    os.scandir walk yielding (path, suffix) for supported files.
+    DirEntry caches the stat from the directory listing, so there is no extra stat per path.
+    Entries are visited name-sorted, depth-first, which is exactly the order of sorted(rglob("*")).
+    Like rglob, symlinked directories are not descended into.
+    """
+    try:
+        with os.scandir(root) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except PermissionError:
+        return
+    for e in entries:
+        if e.is_dir(follow_symlinks=False):
+            yield from _iter_files(e.path)
+            continue
+        suffix = os.path.splitext(e.name)[1].lower()
+        if suffix in SUPPORTED_EXTS and e.is_file():
+            yield e.path, suffix
+
+
+def _decode_text(raw) -> str:
+    # utf-8-sig drops a leading BOM: U+FEFF is outside latin-1, so keeping it would force CPython
+    # to store the whole doc at 2 bytes/char instead of 1 (and it hides the first header from ^\s* regexes)
+    text = str(raw, "utf-8-sig", "ignore")
+    if "\r" in text:
+        # same universal-newline handling read_text applied
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _read_doc(path: str, suffix: str) -> str:
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if suffix != ".json" and size >= MMAP_MIN_BYTES:
+            # decode straight from the page-cache mapping; skips the intermediate bytes copy
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return _decode_text(mm)
+        raw = f.read()
+
+    if suffix == ".json":
+        try:
+            data = json.loads(raw)
+            if isinstance(data, dict) and "text" in data:
+                return str(data["text"])
+            if isinstance(data, list):
+                return "\n".join(str(x) for x in data)
+            return json.dumps(data, ensure_ascii=False, indent=2)
+        except Exception:
+            pass
+    return _decode_text(raw)
+
+
 def load_inputs(input_dir: Path) -> List[Dict[str, str]]:
     if not input_dir.exists():
         raise FileNotFoundError(f"Input dir not found: {input_dir}")
 
-    docs: List[Dict[str, str]] = []
-    for p in sorted(input_dir.rglob("*")):
-        if p.is_dir():
-            continue
-        if p.suffix.lower() not in SUPPORTED_EXTS:
-            continue
+    files = list(_iter_files(input_dir))
 
-        if p.suffix.lower() == ".json":
-            try:
-                data = json.loads(p.read_text(encoding="utf-8"))
-                if isinstance(data, dict) and "text" in data:
-                    text = str(data["text"])
-                elif isinstance(data, list):
-                    text = "\n".join(str(x) for x in data)
-                else:
-                    text = json.dumps(data, ensure_ascii=False, indent=2)
-            except Exception:
-                text = p.read_text(encoding="utf-8", errors="ignore")
-        else:
-            text = p.read_text(encoding="utf-8", errors="ignore")
+    # reads release the GIL, so a thread pool overlaps per-file syscall latency
+    workers = min(32, (os.cpu_count() or 1) * 4, max(1, len(files)))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        texts = list(ex.map(lambda f: _read_doc(*f), files))
 
+    docs: List[Dict[str, str]] = []
+    for (path, _), text in zip(files, texts):
         text = text.strip()
         if text:
-            docs.append({"name": p.name, "text": text})
+            # "name" (the basename) labels items; "path" under input_dir keeps x/notes.txt
+            # and y/notes.txt apart where chunks are keyed per doc
+            docs.append({"name": os.path.basename(path), "path": os.path.relpath(path, input_dir), "text": text})
     return docs
 
 
-def chunk_text(text: str, max_chars: int, overlap: int) -> List[str]:
-    text = text.strip()
-    if not text:
-        return []
-    out: List[str] = []
-    start = 0
-    n = len(text)
+def _strip_span(text: str, start: int, end: int) -> Tuple[int, int]:
+    # offsets of text[start:end].strip() without building the intermediate slice
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def chunk_spans(text: str, max_chars: int, overlap: int) -> List[Tuple[int, int]]:
+    """
+    (start, end) offsets of the chunks chunk_text would return; text[start:end] is already stripped.
+    """
+    lo, n = _strip_span(text, 0, len(text))
+    out: List[Tuple[int, int]] = []
+    start = lo
     while start < n:
         end = min(start + max_chars, n)
-        part = text[start:end].strip()
-        if part:
-            out.append(part)
+        s, e = _strip_span(text, start, end)
+        if s < e:
+            out.append((s, e))
         if end >= n:
             break
-        start = max(0, end - overlap)
+        start = max(lo, end - overlap)
     return out
 
 
+def chunk_text(text: str, max_chars: int, overlap: int) -> List[str]:
+    # each chunk is sliced once, straight from the offsets
+    return [text[s:e] for s, e in chunk_spans(text, max_chars, overlap)]
+
+
 def make_chunks(docs: List[Dict[str, str]], max_chars: int, overlap: int) -> List[Dict[str, str]]:
     chunks: List[Dict[str, str]] = []
     for d in docs:
         for i, part in enumerate(chunk_text(d["text"], max_chars=max_chars, overlap=overlap)):
-            chunks.append({"doc_name": d["name"], "chunk_id": i, "text": part})
+            chunks.append({"doc_name": d["name"], "doc_path": d.get("path", d["name"]), "chunk_id": i, "text": part})
     return chunks
 
 
+# -------------------------
+# Event cards
+# -------------------------
+class EventCard:
+    """
+    One parsed standup/slack/email event.
+    Common fields are slots; kind-specific ones (team, sections, time, subject, ...) live in `fields`.
+    """
+
+    __slots__ = ("kind", "src", "fields", "source_file", "raw_text", "body_text")
+
+    def __init__(
+        self,
+        kind: str,
+        src: str,
+        fields: Dict[str, Any],
+        source_file: str,
+        raw_text: str,
+        body_text: Optional[str] = None,
+    ):
+        self.kind = kind
+        self.src = src
+        self.fields = fields
+        self.source_file = source_file
+        self.raw_text = raw_text
+        self.body_text = body_text
+
+    def to_dict(self) -> Dict[str, Any]:
+        # same key order the debug JSON has always had
+        d: Dict[str, Any] = {"kind": self.kind, "src": self.src}
+        d.update(self.fields)
+        d["source_file"] = self.source_file
+        d["raw_text"] = self.raw_text
+        if self.body_text is not None:
+            d["body_text"] = self.body_text
+        return d
+
+
 # -------------------------
 # Type detectors
 # -------------------------
+# Each detector first checks for a literal its regex cannot match without, so most docs
+# that lack the marker never reach the regex engine.
 def looks_like_any_standup(text: str) -> bool:
-    return bool(text and (STANDUP_PLAIN_HEADER_RE.search(text) or STANDUP_MD_HEADER_RE.search(text)))
+    if not text or ("STANDUP:" not in text and "Daily Standup" not in text):
+        return False
+    return bool(STANDUP_ANY_HEADER_RE.search(text))
 
 
 def looks_like_slack_log(text: str) -> bool:
-    if not text:
+    if not text or "[" not in text or "]" not in text:
         return False
     # at least one root-ish slack line
     for line in text.splitlines():
@@ -208,7 +395,7 @@ def looks_like_slack_log(text: str) -> bool:
 
 
 def looks_like_email_log(text: str) -> bool:
-    return bool(text and EMAIL_SUBJECT_RE.search(text))
+    return bool(text and "Subject:" in text and EMAIL_SUBJECT_RE.search(text))
 
 
 # -------------------------
@@ -218,16 +405,10 @@ def _parse_sections_plain(block: str) -> Dict[str, List[str]]:
     lines = block.splitlines()
     cur = None
     buf: Dict[str, List[str]] = {k: [] for k in SECTION_LABELS.keys()}
-
-    def is_section_header(line: str) -> Optional[str]:
-        s = line.strip().upper()
-        for k, header in SECTION_LABELS.items():
-            if s == header.upper():
-                return k
-        return None
+    header_to_key = _HEADER_TO_KEY
 
     for line in lines:
-        sec = is_section_header(line)
+        sec = header_to_key.get(line.strip().upper())
         if sec is not None:
             cur = sec
             continue
@@ -241,8 +422,8 @@ def _parse_sections_plain(block: str) -> Dict[str, List[str]]:
     return out
 
 
-def parse_standup_plain_cards(text: str, doc_name: str) -> List[Dict[str, Any]]:
-    cards: List[Dict[str, Any]] = []
+def parse_standup_plain_cards(text: str, doc_name: str) -> List[EventCard]:
+    cards: List[EventCard] = []
     if not text:
         return cards
 
@@ -265,21 +446,19 @@ def parse_standup_plain_cards(text: str, doc_name: str) -> List[Dict[str, Any]]:
 
         sections = _parse_sections_plain(block)
 
-        cards.append({
-            "kind": "standup",
-            "src": src,
-            "team": team,
-            "date": date_str,
-            "sections": sections,
-            "source_file": doc_name,
-            "raw_text": block.strip(),
-        })
+        cards.append(EventCard(
+            "standup",
+            src,
+            {"team": team, "date": date_str, "sections": sections},
+            source_file=doc_name,
+            raw_text=block.strip(),
+        ))
 
     return cards
 
 
-def parse_standup_markdown_cards(text: str, doc_name: str) -> List[Dict[str, Any]]:
-    cards: List[Dict[str, Any]] = []
+def parse_standup_markdown_cards(text: str, doc_name: str) -> List[EventCard]:
+    cards: List[EventCard] = []
     if not text:
         return cards
 
@@ -288,14 +467,10 @@ def parse_standup_markdown_cards(text: str, doc_name: str) -> List[Dict[str, Any
         return cards
 
     text = text[m0.start():]
-    blocks = re.split(r"(?=^#\s*Daily Standup\s*[–-]\s*)", text, flags=re.MULTILINE)
+    blocks = STANDUP_MD_SPLIT_RE.split(text)
 
-    def section_body(block: str, section_title: str) -> str:
-        rx = re.compile(
-            rf"^##\s*{re.escape(section_title)}\s*\n(.*?)(?=^##\s*|\Z)",
-            flags=re.MULTILINE | re.DOTALL,
-        )
-        mm = rx.search(block)
+    def section_body(block: str, key: str) -> str:
+        mm = STANDUP_MD_SECTION_RES[key].search(block)
         return (mm.group(1) if mm else "").strip()
 
     for block in blocks:
@@ -312,39 +487,37 @@ def parse_standup_markdown_cards(text: str, doc_name: str) -> List[Dict[str, Any
         src = standup_src(date_str, team)
 
         sections = {
-            "DONE": [x for x in _bullets_from_lines(section_body(block, "Done").splitlines()) if _keep_text(x)],
-            "IN_PROGRESS": [x for x in _bullets_from_lines(section_body(block, "In Progress").splitlines()) if _keep_text(x)],
-            "BLOCKERS": [x for x in _bullets_from_lines(section_body(block, "Blockers").splitlines()) if _keep_text(x)],
-            "RISKS": [x for x in _bullets_from_lines(section_body(block, "Risks / Concerns").splitlines()) if _keep_text(x)],
-            "QUESTIONS": [x for x in _bullets_from_lines(section_body(block, "Questions").splitlines()) if _keep_text(x)],
+            key: [x for x in _bullets_from_lines(section_body(block, key).splitlines()) if _keep_text(x)]
+            for key in STANDUP_MD_SECTION_RES
         }
 
-        cards.append({
-            "kind": "standup",
-            "src": src,
-            "team": team,
-            "date": date_str,
-            "sections": sections,
-            "source_file": doc_name,
-            "raw_text": block.strip(),
-        })
+        cards.append(EventCard(
+            "standup",
+            src,
+            {"team": team, "date": date_str, "sections": sections},
+            source_file=doc_name,
+            raw_text=block.strip(),
+        ))
 
     return cards
 
 
-def parse_any_standup_cards(text: str, doc_name: str) -> List[Dict[str, Any]]:
-    if STANDUP_PLAIN_HEADER_RE.search(text or ""):
+def parse_any_standup_cards(text: str, doc_name: str) -> List[EventCard]:
+    m = STANDUP_ANY_HEADER_RE.search(text or "")
+    if not m:
+        return []
+    # plain format wins anywhere in the doc: a markdown hit only counts if no plain header follows it
+    if m.lastgroup == "plain" or STANDUP_PLAIN_HEADER_RE.search(text, m.start()):
         return parse_standup_plain_cards(text, doc_name)
-    if STANDUP_MD_HEADER_RE.search(text or ""):
-        return parse_standup_markdown_cards(text, doc_name)
-    return []
+    return parse_standup_markdown_cards(text, doc_name)
 
 
-def aggregate_standup_to_one_item(card: Dict[str, Any], llm_texts: List[str], max_llm_notes: int = 3) -> Dict[str, Any]:
-    team = card.get("team") or "Standup"
-    date = card.get("date")
-    src = card.get("src") or standup_src(date, team)
-    sections: Dict[str, List[str]] = (card.get("sections") or {})
+def aggregate_standup_to_one_item(card: EventCard, llm_texts: List[str], max_llm_notes: int = 3) -> Dict[str, Any]:
+    fields = card.fields
+    team = fields.get("team") or "Standup"
+    date = fields.get("date")
+    src = card.src or standup_src(date, team)
+    sections: Dict[str, List[str]] = (fields.get("sections") or {})
 
     done = sections.get("DONE", []) or []
     inprog = sections.get("IN_PROGRESS", []) or []
@@ -416,59 +589,82 @@ def aggregate_standup_to_one_item(card: Dict[str, Any], llm_texts: List[str], ma
 # -------------------------
 # Slack parsing + aggregation
 # -------------------------
-def parse_slack_cards(text: str, doc_name: str) -> List[Dict[str, Any]]:
+def _split_slack_events(text: str) -> List[str]:
+    # a line that is just "---" closes the current event
+    if not LINE_SPLIT_EVENTS:
+        return SLACK_EVENT_SPLIT_RE.split(text)
+    blocks: List[str] = []
+    buf: List[str] = []
+    for line in text.split("\n"):
+        if line.strip() == "---":
+            blocks.append("\n".join(buf))
+            buf = []
+        else:
+            buf.append(line)
+    blocks.append("\n".join(buf))
+    return blocks
+
+
+def parse_slack_cards(text: str, doc_name: str) -> List[EventCard]:
     """
     Split slack log into events by '---'.
     Root message is the first non-indented line like:
       [09:12] Nadia: ...
     Replies can be indented with tabs/spaces and '↳', but we keep raw.
     """
-    cards: List[Dict[str, Any]] = []
+    cards: List[EventCard] = []
     if not text:
         return cards
 
-    blocks = [b.strip("\n") for b in SLACK_EVENT_SPLIT_RE.split(text) if b.strip()]
+    blocks = [b.strip("\n") for b in _split_slack_events(text) if b.strip()]
     for block in blocks:
         root_time = None
         root_name = None
         root_msg = None
 
-        for line in block.splitlines():
-            # root line: no leading whitespace
-            if not line.strip():
-                continue
-            if line.startswith(" ") or line.startswith("\t"):
-                continue
-            m = SLACK_ROOT_RE.match(line.strip())
+        if SPLITLINES_ONLY_BREAKS_RE.search(block) is None:
+            # one anchored search finds the root line without a Python loop over lines
+            m = SLACK_ROOT_LINE_RE.search(block)
             if m:
                 root_time = m.group(1)
                 root_name = m.group(2).strip()
                 root_msg = m.group(3).strip()
-                break
+        else:
+            for line in block.splitlines():
+                # root line: no leading whitespace
+                if not line.strip():
+                    continue
+                if line.startswith(" ") or line.startswith("\t"):
+                    continue
+                m = SLACK_ROOT_RE.match(line.strip())
+                if m:
+                    root_time = m.group(1)
+                    root_name = m.group(2).strip()
+                    root_msg = m.group(3).strip()
+                    break
 
         if not root_time or not root_name:
             continue
 
         src = slack_src(root_time, root_name)
 
-        cards.append({
-            "kind": "slack",
-            "src": src,              # slack_09:12_Nadia
-            "time": root_time,
-            "name": root_name,
-            "root": root_msg or "",
-            "source_file": doc_name,
-            "raw_text": block.strip(),
-        })
+        cards.append(EventCard(
+            "slack",
+            src,                     # slack_09:12_Nadia
+            {"time": root_time, "name": root_name, "root": root_msg or ""},
+            source_file=doc_name,
+            raw_text=block.strip(),
+        ))
 
     return cards
 
 
-def aggregate_slack_to_one_item(card: Dict[str, Any], llm_texts: List[str], max_llm_notes: int = 4) -> Dict[str, Any]:
-    src = card.get("src") or "slack_unknown"
-    time_hm = card.get("time") or "??:??"
-    name = card.get("name") or "Unknown"
-    root = (card.get("root") or "").strip()
+def aggregate_slack_to_one_item(card: EventCard, llm_texts: List[str], max_llm_notes: int = 4) -> Dict[str, Any]:
+    fields = card.fields
+    src = card.src or "slack_unknown"
+    time_hm = fields.get("time") or "??:??"
+    name = fields.get("name") or "Unknown"
+    root = (fields.get("root") or "").strip()
 
     seen = set()
     if root:
@@ -514,15 +710,30 @@ def aggregate_slack_to_one_item(card: Dict[str, Any], llm_texts: List[str], max_
 # -------------------------
 # Email parsing + aggregation
 # -------------------------
-def parse_email_cards(text: str, doc_name: str) -> List[Dict[str, Any]]:
+def _split_emails(text: str) -> List[str]:
+    # every "Subject:" line starts a new email
+    if not LINE_SPLIT_EVENTS:
+        return EMAIL_SPLIT_RE.split(text)
+    blocks: List[str] = []
+    buf: List[str] = []
+    for line in text.split("\n"):
+        if buf and line.lstrip().startswith("Subject:"):
+            blocks.append("\n".join(buf))
+            buf = []
+        buf.append(line)
+    blocks.append("\n".join(buf))
+    return blocks
+
+
+def parse_email_cards(text: str, doc_name: str) -> List[EventCard]:
     """
     Split email log into events by Subject: (lookahead).
     """
-    cards: List[Dict[str, Any]] = []
+    cards: List[EventCard] = []
     if not text:
         return cards
 
-    blocks = [b.strip() for b in EMAIL_SPLIT_RE.split(text) if b.strip()]
+    blocks = [b.strip() for b in _split_emails(text) if b.strip()]
     for block in blocks:
         sm = EMAIL_SUBJECT_RE.search(block)
         if not sm:
@@ -534,31 +745,30 @@ def parse_email_cards(text: str, doc_name: str) -> List[Dict[str, Any]]:
         from_line = fm.group(1).strip() if fm else None
 
         # body: remove Subject/From first lines to keep something readable
-        body = block
-        # remove first "Subject:" line
-        body = re.sub(r"^\s*Subject:.*\n?", "", body, count=1, flags=re.MULTILINE)
+        # every block starts at its Subject: line (EMAIL_SPLIT_RE), so dropping it is a slice
+        _, _, body = block.partition("\n")
         # keep From line but we already extract it; remove it from body for compactness
-        body = re.sub(r"^\s*From:.*\n?", "", body, count=1, flags=re.MULTILINE)
+        body = EMAIL_FROM_STRIP_RE.sub("", body, count=1)
         body = body.strip()
 
-        cards.append({
-            "kind": "email",
-            "src": src,                 # email_<Subject...>
-            "subject": subj,
-            "from": from_line,
-            "source_file": doc_name,
-            "raw_text": block.strip(),
-            "body_text": body,
-        })
+        cards.append(EventCard(
+            "email",
+            src,                        # email_<Subject...>
+            {"subject": subj, "from": from_line},
+            source_file=doc_name,
+            raw_text=block.strip(),
+            body_text=body,
+        ))
 
     return cards
 
 
-def aggregate_email_to_one_item(card: Dict[str, Any], llm_texts: List[str], max_llm_notes: int = 5) -> Dict[str, Any]:
-    src = card.get("src") or "email_no_subject"
-    subject = card.get("subject") or ""
-    from_line = card.get("from")
-    body = (card.get("body_text") or "").strip()
+def aggregate_email_to_one_item(card: EventCard, llm_texts: List[str], max_llm_notes: int = 5) -> Dict[str, Any]:
+    fields = card.fields
+    src = card.src or "email_no_subject"
+    subject = fields.get("subject") or ""
+    from_line = fields.get("from")
+    body = (card.body_text or "").strip()
 
     seen = set()
     if subject:
@@ -584,7 +794,7 @@ def aggregate_email_to_one_item(card: Dict[str, Any], llm_texts: List[str], max_
     excerpt = ""
     if not llm_notes and body:
         # take first ~240 chars
-        excerpt = re.sub(r"\s+", " ", body)[:240].strip()
+        excerpt = WS_RUN_RE.sub(" ", body)[:240].strip()
 
     title = f"EMAIL: {subject}" if subject else "EMAIL"
     parts = [title]
@@ -611,7 +821,7 @@ def aggregate_email_to_one_item(card: Dict[str, Any], llm_texts: List[str], max_
 # -------------------------
 # Chunk builder for events (standup/slack/email)
 # -------------------------
-def make_event_chunks(cards: List[Dict[str, Any]], max_chars: int, overlap: int) -> List[Dict[str, str]]:
+def make_event_chunks(cards: Iterable[EventCard], max_chars: int, overlap: int) -> List[Dict[str, str]]:
     """
     For each card, chunks over its raw_text.
     Returns dict with:
@@ -619,11 +829,15 @@ def make_event_chunks(cards: List[Dict[str, Any]], max_chars: int, overlap: int)
     """
     out: List[Dict[str, str]] = []
     for c in cards:
-        src = c.get("src")
-        kind = c.get("kind")
-        raw = (c.get("raw_text") or "").strip()
+        src = c.src
+        kind = c.kind
+        raw = (c.raw_text or "").strip()
         if not src or not kind or not raw:
             continue
+        if len(raw) <= max_chars:
+            # most slack/email events fit in a single chunk
+            out.append({"kind": kind, "src": src, "chunk_id": 0, "text": raw})
+            continue
         parts = chunk_text(raw, max_chars=max_chars, overlap=overlap)
         for i, part in enumerate(parts):
             out.append({
@@ -635,9 +849,179 @@ def make_event_chunks(cards: List[Dict[str, Any]], max_chars: int, overlap: int)
     return out
 
 
+def dedupe_chunks(chunks: List[Dict[str, str]], src_key: str) -> List[Dict[str, str]]:
+    """
+    Drop chunks whose whitespace/case-normalized text already appeared under the same
+    source (chunk[src_key]); a repeat can only yield items the first copy already produced.
+    """
+    seen = set()
+    out: List[Dict[str, str]] = []
+    for ch in chunks:
+        norm = " ".join(ch["text"].split()).lower()
+        h = (ch[src_key], hashlib.blake2b(norm.encode("utf-8"), digest_size=8).digest())
+        if h in seen:
+            continue
+        seen.add(h)
+        out.append(ch)
+    return out
+
+
+# -------------------------
+# Per-doc parsing (optionally across processes)
+# -------------------------
+PARALLEL_PARSE_MIN_CHARS = 1_000_000  # below this, worker start-up costs more than it saves
+
+# (kind, detector, parser) in precedence order: the first detector that fires owns the doc
+DOC_KINDS = (
+    ("standup", looks_like_any_standup, parse_any_standup_cards),
+    ("email", looks_like_email_log, parse_email_cards),
+    ("slack", looks_like_slack_log, parse_slack_cards),
+)
+
+
+def doc_kind(text: str) -> str:
+    for kind, detect, _ in DOC_KINDS:
+        if detect(text):
+            return kind
+    return "doc"
+
+
+_PARSERS = {kind: parse for kind, _, parse in DOC_KINDS}
+
+# A slack/email doc bigger than this is parsed as shards of about this size, cut at lines
+# the event splitters cut at anyway ("---" / "Subject:"), so the shards' cards concatenate
+# to exactly the whole doc's cards.
+PARSE_SHARD_CHARS = 1 << 20
+SLACK_SEP_LINE_RE = re.compile(r"^[^\S\n]*---[^\S\n]*$", flags=re.MULTILINE)
+EMAIL_SUBJECT_LINE_RE = re.compile(r"^[^\S\n]*Subject:", flags=re.MULTILINE)
+
+
+def _shard_text(text: str, kind: str) -> List[str]:
+    sep = {"slack": SLACK_SEP_LINE_RE, "email": EMAIL_SUBJECT_LINE_RE}.get(kind)
+    if sep is None or not LINE_SPLIT_EVENTS or len(text) <= 2 * PARSE_SHARD_CHARS:
+        return [text]
+    shards: List[str] = []
+    start = 0
+    while len(text) - start > 2 * PARSE_SHARD_CHARS:
+        m = sep.search(text, start + PARSE_SHARD_CHARS)
+        if m is None:
+            break
+        # m starts a line, so text[m.start() - 1] is the "\n" that ends the shard's last line
+        shards.append(text[start:m.start() - 1])
+        # slack drops the "---" line itself; an email's Subject: line opens the next shard
+        start = m.end() + 1 if kind == "slack" else m.start()
+    shards.append(text[start:])
+    return shards
+
+
+def _parse_task(
+    task: Tuple[Optional[str], str, str], max_chars: int, overlap: int, chunk_events: bool = True
+) -> Tuple[str, List[EventCard], List[Dict[str, str]]]:
+    """
+    Card parsing + event chunking for (kind, text, doc name); kind None means detect it first.
+    Returns (kind, cards, event_chunks); kind "doc" means a normal doc with no cards.
+    event_chunks is always empty when chunk_events is False (nothing will be sent to the LLM).
+    """
+    kind, text, name = task
+    if kind is None:
+        kind = doc_kind(text)
+    if kind == "doc":
+        return "doc", [], []
+    cards = _PARSERS[kind](text, doc_name=name)
+    ev_chunks = make_event_chunks(cards, max_chars=max_chars, overlap=overlap) if chunk_events else []
+    return kind, cards, ev_chunks
+
+
+def _parse_one(
+    doc: Dict[str, str], max_chars: int, overlap: int, chunk_events: bool = True
+) -> Tuple[str, List[EventCard], List[Dict[str, str]]]:
+    """
+    Type detection + card parsing + event chunking for one doc.
+    Returns (kind, cards, event_chunks); kind "doc" means a normal doc with no cards.
+    """
+    return _parse_task((None, doc["text"], doc["name"]), max_chars, overlap, chunk_events)
+
+
+def parse_docs(
+    docs: List[Dict[str, str]], max_chars: int, overlap: int, chunk_events: bool = True, jobs: int = 0
+) -> List[Tuple[str, List[EventCard], List[Dict[str, str]]]]:
+    """
+    _parse_one over every doc, in doc order.
+    Parsing is pure Python and independent per doc, so big inputs fan out over a process pool;
+    a single huge slack/email log is split into shards first so it does not pin one worker.
+    jobs: worker processes; 0 = one per CPU once the input reaches PARALLEL_PARSE_MIN_CHARS,
+    1 = always in-process.
+    """
+    if jobs == 1 or (jobs <= 0 and sum(len(d["text"]) for d in docs) < PARALLEL_PARSE_MIN_CHARS):
+        return [_parse_one(d, max_chars, overlap, chunk_events) for d in docs]
+
+    tasks: List[Tuple[Optional[str], str, str]] = []
+    owner: List[int] = []
+    for di, d in enumerate(docs):
+        text, name = d["text"], d["name"]
+        shards = [text]
+        kind: Optional[str] = None
+        if len(text) > 2 * PARSE_SHARD_CHARS:
+            kind = doc_kind(text)
+            shards = _shard_text(text, kind)
+        tasks.extend((kind, sh, name) for sh in shards)
+        owner.extend([di] * len(shards))
+
+    parse = partial(_parse_task, max_chars=max_chars, overlap=overlap, chunk_events=chunk_events)
+    workers = min(len(tasks), jobs if jobs > 0 else os.cpu_count() or 1)
+    if workers < 2:
+        parsed = [parse(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            parsed = list(ex.map(parse, tasks, chunksize=max(1, len(tasks) // (4 * workers))))
+
+    out: List[Tuple[str, List[EventCard], List[Dict[str, str]]]] = []
+    for di, (kind, cards, ev_chunks) in zip(owner, parsed):
+        if len(out) > di:
+            out[di][1].extend(cards)
+            out[di][2].extend(ev_chunks)
+        else:
+            out.append((kind, cards, ev_chunks))
+    return out
+
+
 # -------------------------
 # Normalization + priority
 # -------------------------
+class Item:
+    """
+    Sanitized report item. Known fields are slots; any other keys the LLM sent ride along in `extra`.
+    Converted back to a plain dict (same keys, same order as before) once the report is built.
+    """
+
+    __slots__ = ("type", "text", "channel", "source", "owner", "due", "priority", "priority_reason", "extra", "keys")
+
+    # known fields, in the order sanitize_item used to add them when missing from the input
+    FIELDS = ("text", "type", "priority", "source", "channel", "owner", "due", "priority_reason")
+
+    def __init__(self, text: str, type: str, priority: str, source: str, channel: str, owner: Any, due: Any):
+        self.text = text
+        self.type = type
+        self.priority = priority
+        self.source = source
+        self.channel = channel
+        self.owner = owner
+        self.due = due
+        self.priority_reason: Dict[str, str] = {}
+        self.extra: Optional[Dict[str, Any]] = None
+        self.keys: Tuple[str, ...] = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        extra = self.extra or {}
+        out: Dict[str, Any] = {}
+        for k in self.keys:
+            out[k] = getattr(self, k) if k in Item.FIELDS else extra[k]
+        for k in Item.FIELDS:
+            if k not in out:
+                out[k] = getattr(self, k)
+        return out
+
+
 def sanitize_priority(p: Any) -> str:
     if not p:
         return "P2"
@@ -674,8 +1058,17 @@ def infer_channel_from_name(name_or_source: str) -> str:
     return "doc"
 
 
+_CHANNEL_LABELS = {"email": "Email", "slack": "Slack", "standup": "Standup", "doc": "Doc"}
+
+
 def channel_label(ch: str) -> str:
-    return {"email": "Email", "slack": "Slack", "standup": "Standup", "doc": "Doc"}.get((ch or "doc").lower(), "Doc")
+    return _CHANNEL_LABELS.get((ch or "doc").lower(), "Doc")
+
+
+def _item_channel_label(it: Dict[str, Any]) -> str:
+    # report items already carry one of the canonical channels: one dict hit, no lower()
+    ch = it.get("channel")
+    return _CHANNEL_LABELS.get(ch) or channel_label(ch)
 
 
 def normalize_flags(flags: Any) -> Dict[str, bool]:
@@ -693,15 +1086,15 @@ def normalize_flags(flags: Any) -> Dict[str, bool]:
     return base
 
 
-def infer_flags_fallback(it: Dict[str, Any]) -> Dict[str, bool]:
-    txt = (it.get("text") or "").lower()
+def infer_flags_fallback(it: Item) -> Dict[str, bool]:
+    txt = (it.text or "").lower()
 
-    financial = any(k in txt for k in ["aed", "usd", "payment", "payout", "settlement", "ledger", "chargeback", "refund", "batch", "merchant"])
-    requires_action = any(k in txt for k in ["confirm", "investigate", "review", "pause", "escalate", "fix", "follow up", "need a quick review", "ok to", "who owns"])
-    no_access = any(k in txt for k in ["no production access", "no access", "cannot access", "can't access", "unable to access", "no dashboard"])
-    blocking = (it.get("type") == "blocker") or no_access or ("blockers:" in txt)
-    informational = it.get("type") in ("done", "info") and not requires_action and not blocking
-    manager_attention = financial or blocking or requires_action or (it.get("channel") in ("standup", "email", "slack"))
+    financial = FINANCIAL_RE.search(txt) is not None
+    requires_action = REQUIRES_ACTION_RE.search(txt) is not None
+    no_access = NO_ACCESS_RE.search(txt) is not None
+    blocking = (it.type == "blocker") or no_access or ("blockers:" in txt)
+    informational = it.type in ("done", "info") and not requires_action and not blocking
+    manager_attention = financial or blocking or requires_action or (it.channel in ("standup", "email", "slack"))
 
     return {
         "requires_action": bool(requires_action),
@@ -712,23 +1105,23 @@ def infer_flags_fallback(it: Dict[str, Any]) -> Dict[str, bool]:
     }
 
 
-def compute_policy_priority(it: Dict[str, Any]) -> Tuple[str, str]:
-    text = (it.get("text") or "").lower()
-    t = (it.get("type") or "").lower()
-    flags = it.get("flags", {}) or {}
+def compute_policy_priority(it: Item, flags: Dict[str, bool]) -> Tuple[str, str]:
+    text = (it.text or "").lower()
+    t = (it.type or "").lower()
+    flags = flags or {}
 
-    financial = bool(flags.get("financial_risk")) or any(k in text for k in ["aed", "usd", "settlement", "ledger", "payout", "payment", "chargeback", "refund", "batch", "merchant"])
-    mismatch = any(k in text for k in ["mismatch", "difference", "reconcile", "reconciliation", "ledger totals", "missing-row", "doesn't match", "does not match"])
-    payments_core = any(k in text for k in ["settlement", "ledger", "payout", "merchant", "batch"])
+    financial = bool(flags.get("financial_risk")) or FINANCIAL_RE.search(text) is not None
+    mismatch = MISMATCH_RE.search(text) is not None
+    payments_core = PAYMENTS_CORE_RE.search(text) is not None
     urgent = bool(URGENT_RE.search(text)) or ("before eod" in text) or ("may delay" in text) or ("delay" in text)
 
-    fraudish = any(k in text for k in ["abnormal", "suspicious", "fraud", "abuse", "incentive", "affiliate", "chargeback spike", "chargeback spikes"])
-    sla = any(k in text for k in ["latency", "spiking", "sla", "response times"])
+    fraudish = FRAUDISH_RE.search(text) is not None
+    sla = SLA_RE.search(text) is not None
 
-    no_access = any(k in text for k in ["no production access", "no access", "cannot access", "can't access", "unable to access", "no dashboard"])
+    no_access = NO_ACCESS_RE.search(text) is not None
     blocking = bool(flags.get("blocking")) or t == "blocker" or no_access or ("blockers:" in text)
 
-    planning = any(k in text for k in ["ui copy", "final qa", "move release", "release to friday", "planning", "fee breakdown", "proposal"])
+    planning = PLANNING_RE.search(text) is not None
 
     # P0
     if financial and mismatch and payments_core:
@@ -753,41 +1146,51 @@ def compute_policy_priority(it: Dict[str, Any]) -> Tuple[str, str]:
     return "P2", "default"
 
 
-def sanitize_item(it: Any) -> Dict[str, Any]:
-    if not isinstance(it, dict):
-        return {}
+# canonical interned instances of the fixed tags: .strip().lower() builds a fresh str per item,
+# mapping it back here lets later ==, set and dict checks short-circuit on identity
+_CHANNELS = {c: sys.intern(c) for c in ("email", "slack", "standup", "doc")}
+_ITEM_TYPES = {t: sys.intern(t) for t in ("done", "blocker", "risk", "decision", "question", "info")}
 
-    out = dict(it)
-    out["text"] = (out.get("text") or "").strip()
-    if not out["text"]:
-        return {}
 
-    out["type"] = (out.get("type") or "info").strip().lower()
-    out["priority"] = sanitize_priority(out.get("priority"))
-    out["source"] = (out.get("source") or "").strip() or "—"
+def sanitize_item(it: Any) -> Optional[Item]:
+    if not isinstance(it, dict):
+        return None
 
-    ch = (out.get("channel") or "").strip().lower()
-    if ch not in ("email", "slack", "standup", "doc"):
-        ch = infer_channel_from_name(out.get("source", ""))
-    out["channel"] = ch
+    text = (it.get("text") or "").strip()
+    if not text:
+        return None
 
-    out["owner"] = out.get("owner")
-    out["due"] = out.get("due")
+    source = (it.get("source") or "").strip() or "—"
+    ch = _CHANNELS.get((it.get("channel") or "").strip().lower())
+    if ch is None:
+        ch = infer_channel_from_name(source)
+    typ = (it.get("type") or "info").strip().lower()
+
+    out = Item(
+        text=text,
+        type=_ITEM_TYPES.get(typ, typ),
+        priority=sanitize_priority(it.get("priority")),
+        source=source,
+        channel=ch,
+        owner=it.get("owner"),
+        due=it.get("due"),
+    )
+    # flags only feed the policy below; they are not part of the report payload
+    out.keys = tuple(k for k in it if k != "flags")
+    extra = {k: it[k] for k in out.keys if k not in Item.FIELDS}
+    if extra:
+        out.extra = extra
 
-    flags = normalize_flags(out.get("flags"))
+    flags = normalize_flags(it.get("flags"))
     if not any(flags.values()):
         flags = infer_flags_fallback(out)
-    out["flags"] = flags
 
-    policy_p, policy_reason = compute_policy_priority(out)
-    llm_p = out.get("priority", "P2")
+    policy_p, policy_reason = compute_policy_priority(out, flags)
+    llm_p = out.priority
     final_p = policy_p if severity(policy_p) > severity(llm_p) else llm_p
 
-    out["priority"] = final_p
-    out["priority_reason"] = {"llm": llm_p, "policy": policy_p, "policy_reason": policy_reason, "final": final_p}
-
-    # remove flags from report payload
-    out.pop("flags", None)
+    out.priority = final_p
+    out.priority_reason = {"llm": llm_p, "policy": policy_p, "policy_reason": policy_reason, "final": final_p}
 
     return out
 
@@ -795,31 +1198,28 @@ def sanitize_item(it: Any) -> Dict[str, Any]:
 # -------------------------
 # Dedup
 # -------------------------
-def dedupe_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    seen = set()
-    out: List[Dict[str, Any]] = []
-    for it in items:
-        key = (it.get("priority"), it.get("channel"), (it.get("text") or "").strip().lower())
-        if key in seen:
-            continue
-        seen.add(key)
-        out.append(it)
-    return out
+EVENT_SRC_PREFIXES = ("standup_", "slack_", "email_")
 
 
-def dedupe_one_event_per_src(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def dedupe_items(items: List[Item]) -> List[Item]:
     """
-    Hard rule: only ONE item per event src in final items.
-    Applies to standup_/slack_/email_
+    Single pass over items applying both rules:
+      - hard rule: only ONE item per event src (standup_/slack_/email_)
+      - then drop repeats of (priority, channel, text)
     """
-    out: List[Dict[str, Any]] = []
     seen_src = set()
+    seen = set()
+    out: List[Item] = []
     for it in items:
-        src = (it.get("source") or "").strip()
-        if src.startswith("standup_") or src.startswith("slack_") or src.startswith("email_"):
+        src = it.source.strip()
+        if src.startswith(EVENT_SRC_PREFIXES):
             if src in seen_src:
                 continue
             seen_src.add(src)
+        key = (it.priority, it.channel, it.text.strip().lower())
+        if key in seen:
+            continue
+        seen.add(key)
         out.append(it)
     return out
 
@@ -827,18 +1227,29 @@ def dedupe_one_event_per_src(items: List[Dict[str, Any]]) -> List[Dict[str, Any]
 # -------------------------
 # Report
 # -------------------------
-def build_report(items: List[Dict[str, Any]], generated_iso: str) -> Dict[str, Any]:
+def build_report(items: List[Dict[str, Any]], generated_iso: str, manager_summary: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Sanitize, dedupe and group items by priority.
+    manager_summary (LLM bullets) replaces the per-priority counts when given and non-empty.
+    """
     clean = [sanitize_item(x) for x in items]
     clean = [x for x in clean if x]
 
-    clean = dedupe_one_event_per_src(clean)
     clean = dedupe_items(clean)
 
-    clean.sort(key=lambda x: (prio_rank(x.get("priority")), channel_label(x.get("channel")), x.get("text", "")))
-
-    groups = {"P0": [], "P1": [], "P2": []}
+    # bucket by priority first, then sort each bucket; concatenated P0/P1/P2 this is the old
+    # (prio_rank, channel_label, text) order, since channel is one of doc/email/slack/standup here
+    buckets: Dict[str, List[Item]] = {"P0": [], "P1": [], "P2": []}
     for it in clean:
-        groups[it.get("priority", "P2")].append(it)
+        buckets[it.priority].append(it)
+
+    by_channel_text = attrgetter("channel", "text")
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    rows: List[Dict[str, Any]] = []
+    for p, bucket in buckets.items():
+        bucket.sort(key=by_channel_text)
+        groups[p] = [it.to_dict() for it in bucket]
+        rows.extend(groups[p])
 
     p0 = len(groups.get("P0", []) or [])
     p1 = len(groups.get("P1", []) or [])
@@ -852,56 +1263,48 @@ def build_report(items: List[Dict[str, Any]], generated_iso: str) -> Dict[str, A
     return {
         "app": APP_TITLE,
         "generated": generated_iso,
-        "manager_summary": summary_counts,
+        "manager_summary": manager_summary or summary_counts,
         "groups": groups,
-        "followups_all": clean,
+        "followups_all": rows,
     }
 
 
 # -------------------------
 # Rendering
 # -------------------------
+# report group order and headings, shared by the markdown and HTML renderers
+_PRIORITY_HEADERS = {"P0": "🔥 HIGH / P0", "P1": "🟡 MEDIUM / P1", "P2": "🟢 LOW / P2"}
+
+
 def render_markdown_compact(report: Dict[str, Any]) -> str:
     generated = report.get("generated", "")
 
-    lines: List[str] = []
-    lines.append(f"# {APP_TITLE}")
-    lines.append(f"_Generated: {generated}_")
-    lines.append("")
+    lines: List[str] = [f"# {APP_TITLE}", f"_Generated: {generated}_", ""]
 
     ms = report.get("manager_summary", [])
     if ms:
         lines.append("## Manager Summary (LLM)")
-        for b in ms[:8]:
-            lines.append(f"- {b}")
+        lines.extend(f"- {b}" for b in ms[:8])
         lines.append("")
 
-    def header_for(p: str) -> str:
-        if p == "P0":
-            return "🔥 HIGH / P0"
-        if p == "P1":
-            return "🟡 MEDIUM / P1"
-        return "🟢 LOW / P2"
-
     groups = report.get("groups", {}) or {}
-    for p in ["P0", "P1", "P2"]:
-        lines.append(f"## {header_for(p)}")
+    for p, header in _PRIORITY_HEADERS.items():
+        lines.append(f"## {header}")
         arr = groups.get(p, []) or []
         if not arr:
             lines.append("_None_")
             lines.append("")
             continue
-        for it in arr:
-            ch = channel_label(it.get("channel"))
-            lines.append(f"- **[{ch}]** {it.get('text','')}  _(src: {it.get('source','—')})_")
+        lines.extend(
+            f"- **[{_item_channel_label(it)}]** {it.get('text','')}  _(src: {it.get('source','—')})_"
+            for it in arr
+        )
         lines.append("")
 
     return "\n".join(lines)
 
 
-def render_html_compact(report: Dict[str, Any]) -> str:
-    tpl = Template(
-        """
+_HTML_TEMPLATE_SRC = """
 <!doctype html>
 <html>
 <head>
@@ -935,10 +1338,10 @@ def render_html_compact(report: Dict[str, Any]) -> str:
   {% endif %}
 
   <div class="cols">
-    {% for p in ["P0","P1","P2"] %}
+    {% for p, header in priority_headers.items() %}
     <div class="card" style="margin:0;">
       <h3 style="margin-top:0;">
-        {% if p == "P0" %}🔥 HIGH / P0{% elif p == "P1" %}🟡 MEDIUM / P1{% else %}🟢 LOW / P2{% endif %}
+        {{ header }}
       </h3>
       <ul>
         {% set arr = groups.get(p, []) %}
@@ -959,12 +1362,27 @@ def render_html_compact(report: Dict[str, Any]) -> str:
 </body>
 </html>
         """
-    )
 
+
+def _bytecode_cache() -> Optional[FileSystemBytecodeCache]:
+    # compiled template persisted in the per-user temp cache dir; keyed by source checksum
+    try:
+        return FileSystemBytecodeCache()
+    except (OSError, RuntimeError):
+        return None
+
+
+_JINJA_ENV = Environment(
+    loader=DictLoader({"report.html": _HTML_TEMPLATE_SRC}),
+    bytecode_cache=_bytecode_cache(),
+)
+
+
+def render_html_compact(report: Dict[str, Any]) -> str:
     def pack_item(it: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "priority": it.get("priority", "P2"),
-            "channel_label": channel_label(it.get("channel")),
+            "channel_label": _item_channel_label(it),
             "text": it.get("text", ""),
             "source": it.get("source", "—"),
         }
@@ -973,23 +1391,78 @@ def render_html_compact(report: Dict[str, Any]) -> str:
         "app": report.get("app", APP_TITLE),
         "generated": report.get("generated", ""),
         "manager_summary": (report.get("manager_summary") or [])[:8],
+        "priority_headers": _PRIORITY_HEADERS,
         "groups": {k: [pack_item(x) for x in v] for k, v in (report.get("groups") or {}).items()},
     }
-    return tpl.render(**payload)
+    return _JINJA_ENV.get_template("report.html").render(**payload)
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    # a crash mid-write leaves the previous file (or none), never a truncated one
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def write_outputs(out_dir: Path, outputs: List[Tuple[str, Callable[[], Any]]]) -> None:
+    """
+    Render and write each (file name, render) pair on a small thread pool; render
+    returns str (written as UTF-8) or already-encoded bytes.
+    Targets are distinct, so one file's write overlaps the next one's rendering.
+    """
+    def write(entry: Tuple[str, Callable[[], Any]]) -> None:
+        name, render = entry
+        data = render()
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        _atomic_write_bytes(out_dir / name, data)
+
+    with ThreadPoolExecutor(max_workers=min(4, max(1, len(outputs)))) as ex:
+        list(ex.map(write, outputs))
 
 
 # -------------------------
 # LLM selection
 # -------------------------
 def pick_llm(args, extract_timeout: int):
-    if args.llm == "ollama":
-        if ollama_is_available(base_url=args.ollama_url):
-            if extract_timeout != args.timeout:
-                extract_llm = OllamaLLM(LLMConfig(mode="ollama", model=args.ollama_model, base_url=args.ollama_url, timeout=extract_timeout))
-                summarize_llm = OllamaLLM(LLMConfig(mode="ollama", model=args.ollama_model, base_url=args.ollama_url, timeout=args.timeout))
-                return extract_llm, summarize_llm
-            llm = OllamaLLM(LLMConfig(mode="ollama", model=args.ollama_model, base_url=args.ollama_url, timeout=args.timeout))
-            return llm, llm
+    """
+    (extract LLM, summarize LLM). A role this run will not use gets NoneLLM, and when
+    neither is used Ollama is not even probed.
+    """
+    want_extract = not args.skip_llm_extract
+    want_summary = args.summarize
+    if args.llm == "ollama" and (want_extract or want_summary):
+        urls = [u.strip().rstrip("/") for u in args.ollama_url.split(",") if u.strip()]
+        live = [u for u in urls if ollama_is_available(base_url=u)]
+        for u in urls:
+            if u not in live:
+                print(f"[warn] Ollama not available at {u}; skipping it.")
+        if live:
+            def cfg(timeout: int) -> LLMConfig:
+                return LLMConfig(
+                    mode="ollama",
+                    model=args.ollama_model,
+                    base_url=live[0],
+                    base_urls=live,
+                    timeout=timeout,
+                    concurrency=args.llm_concurrency,
+                    rpm=args.llm_rpm,
+                    retries=args.llm_retries,
+                    reply_timeout=args.reply_timeout,
+                    cache_path=args.llm_cache or None,
+                )
+
+            if want_extract and want_summary and extract_timeout == args.timeout:
+                llm = OllamaLLM(cfg(args.timeout))
+                return llm, llm
+            return (
+                OllamaLLM(cfg(extract_timeout)) if want_extract else NoneLLM(),
+                OllamaLLM(cfg(args.timeout)) if want_summary else NoneLLM(),
+            )
         print("[warn] Ollama not available. Falling back to --llm none.")
     none = NoneLLM()
     return none, none
@@ -1004,12 +1477,22 @@ def main():
     ap.add_argument("--output", default="outputs", help="Output folder")
     ap.add_argument("--llm", default="none", choices=["none", "ollama"], help="LLM mode")
     ap.add_argument("--ollama-model", default="phi3:mini", help="Ollama model name")
-    ap.add_argument("--ollama-url", default="http://localhost:11434", help="Ollama base url")
+    ap.add_argument("--ollama-url", default="http://localhost:11434", help="Ollama base url; comma-separated list to spread calls over several instances")
     ap.add_argument("--timeout", type=int, default=120, help="LLM summarize timeout seconds")
-    ap.add_argument("--extract-timeout", type=int, default=45, help="LLM extract timeout seconds")
+    ap.add_argument("--extract-timeout", type=int, default=20, help="LLM extract read timeout seconds per attempt (retried, see --llm-retries)")
+    ap.add_argument("--reply-timeout", type=int, default=45, help="Cap in seconds on one whole streamed extract reply, not retried; scaled up for --llm-batch prompts and never below the read timeouts")
     ap.add_argument("--skip-llm-extract", action="store_true", help="Skip LLM extraction step")
+    ap.add_argument("--summarize", action="store_true", help="Ask the LLM for a manager summary (replaces the P0/P1/P2 counts)")
+    ap.add_argument("--llm-concurrency", type=int, default=None, help="Max in-flight LLM extract calls (default: 2 per Ollama url)")
+    ap.add_argument("--llm-rpm", type=int, default=0, help="Max LLM calls per minute per Ollama url (0 = unlimited)")
+    ap.add_argument("--llm-retries", type=int, default=2, help="Retries per LLM call after a connect/first-byte timeout, dropped connection or 429/5xx, with exponential backoff")
+    ap.add_argument("--llm-batch", type=int, default=1, help="Pack up to K chunks shorter than max-chars/3 into one LLM extract prompt (1 = off)")
+    ap.add_argument("--llm-cache", default=None, help="LLM cache file (default: <output>/.llm_cache.sqlite; '' disables)")
     ap.add_argument("--max-chars", type=int, default=1200, help="Chunk size (chars)")
     ap.add_argument("--overlap", type=int, default=120, help="Chunk overlap (chars)")
+    ap.add_argument("--dedup-chunks", action=argparse.BooleanOptionalAction, default=True,
+                    help="Skip chunks repeating an earlier chunk of the same source before LLM extraction")
+    ap.add_argument("--jobs", type=int, default=0, help="Parser processes (0 = auto: one per CPU on large inputs; 1 = no subprocesses)")
     ap.add_argument("--standup-llm-notes", type=int, default=3, help="Max extra LLM notes per standup")
     ap.add_argument("--slack-llm-notes", type=int, default=4, help="Max extra LLM notes per slack event")
     ap.add_argument("--email-llm-notes", type=int, default=5, help="Max extra LLM notes per email event")
@@ -1018,105 +1501,136 @@ def main():
     in_dir = Path(args.input)
     out_dir = Path(args.output)
     out_dir.mkdir(parents=True, exist_ok=True)
+    if args.llm_cache is None:
+        args.llm_cache = str(out_dir / ".llm_cache.sqlite")
 
     docs = load_inputs(in_dir)
 
-    # Split docs by type
-    standup_docs: List[Dict[str, str]] = []
-    slack_docs: List[Dict[str, str]] = []
-    email_docs: List[Dict[str, str]] = []
+    # Split docs by type + parse event cards
     other_docs: List[Dict[str, str]] = []
+    cards_by_kind: Dict[str, List[EventCard]] = {"standup": [], "slack": [], "email": []}
+    event_chunks_by_kind: Dict[str, List[Dict[str, str]]] = {"standup": [], "slack": [], "email": []}
 
-    for d in docs:
-        t = d["text"]
-        if looks_like_any_standup(t):
-            standup_docs.append(d)
-        elif looks_like_email_log(t):
-            email_docs.append(d)
-        elif looks_like_slack_log(t):
-            slack_docs.append(d)
-        else:
+    parsed = parse_docs(docs, max_chars=args.max_chars, overlap=args.overlap, chunk_events=not args.skip_llm_extract, jobs=args.jobs)
+    for d, (kind, cards, ev_chunks) in zip(docs, parsed):
+        if kind == "doc":
             other_docs.append(d)
+            continue
+        cards_by_kind[kind].extend(cards)
+        event_chunks_by_kind[kind].extend(ev_chunks)
 
-    # Non-event chunks (normal)
-    chunks = make_chunks(other_docs, max_chars=args.max_chars, overlap=args.overlap)
+    standup_cards = cards_by_kind["standup"]
+    slack_cards = cards_by_kind["slack"]
+    email_cards = cards_by_kind["email"]
 
     llm_extract, llm_summarize = pick_llm(args, extract_timeout=args.extract_timeout)
 
-    # Parse event cards
-    standup_cards: List[Dict[str, Any]] = []
-    for d in standup_docs:
-        standup_cards.extend(parse_any_standup_cards(d["text"], doc_name=d["name"]))
-
-    slack_cards: List[Dict[str, Any]] = []
-    for d in slack_docs:
-        slack_cards.extend(parse_slack_cards(d["text"], doc_name=d["name"]))
-
-    email_cards: List[Dict[str, Any]] = []
-    for d in email_docs:
-        email_cards.extend(parse_email_cards(d["text"], doc_name=d["name"]))
-
-    all_event_cards = standup_cards + slack_cards + email_cards
-
-    # LLM extract on event chunks -> collect texts per src (but don't add chunk items to final!)
-    llm_texts_by_src: DefaultDict[str, List[str]] = defaultdict(list)
-
-    if not args.skip_llm_extract and all_event_cards:
-        event_chunks = make_event_chunks(all_event_cards, max_chars=args.max_chars, overlap=args.overlap)
-        for ch in event_chunks:
-            src = ch["src"]
-            source = f"{src}:chunk{ch['chunk_id']}"
-            try:
-                res = llm_extract.extract_items(ch["text"], source=source)
-                for it in (res.get("items") or []):
-                    txt = (it.get("text") or "").strip()
-                    if txt:
-                        llm_texts_by_src[src].append(txt)
-            except Exception as e:
-                print(f"[warn] LLM extract failed on {source}: {e}")
-
-    # Build ONE aggregated item per event
-    items: List[Dict[str, Any]] = []
-
-    for c in standup_cards:
-        src = c.get("src")
-        items.append(aggregate_standup_to_one_item(c, llm_texts_by_src.get(src, []), max_llm_notes=args.standup_llm_notes))
-
-    for c in slack_cards:
-        src = c.get("src")
-        items.append(aggregate_slack_to_one_item(c, llm_texts_by_src.get(src, []), max_llm_notes=args.slack_llm_notes))
-
-    for c in email_cards:
-        src = c.get("src")
-        items.append(aggregate_email_to_one_item(c, llm_texts_by_src.get(src, []), max_llm_notes=args.email_llm_notes))
+    # pooled sessions and the reply cache are released even if extraction blows up
+    with llm_extract, llm_summarize:
+        # One LLM submission for event chunks + normal doc chunks, so both sets overlap on the pool
+        event_chunks: List[Dict[str, str]] = []
+        doc_chunks: List[Dict[str, str]] = []
+        if not args.skip_llm_extract:
+            # same order make_event_chunks(chain(standup_cards, slack_cards, email_cards)) would give
+            event_chunks = list(chain(event_chunks_by_kind["standup"], event_chunks_by_kind["slack"], event_chunks_by_kind["email"]))
+            # Non-event chunks (normal)
+            doc_chunks = make_chunks(other_docs, max_chars=args.max_chars, overlap=args.overlap)
+            if args.dedup_chunks:
+                event_chunks = dedupe_chunks(event_chunks, "src")
+                doc_chunks = dedupe_chunks(doc_chunks, "doc_path")
+
+        event_sources = [f"{ch['src']}:chunk{ch['chunk_id']}" for ch in event_chunks]
+        doc_sources = [f"{ch['doc_name']}:chunk{ch['chunk_id']}" for ch in doc_chunks]
+        pairs = [(ch["text"], s) for ch, s in zip(event_chunks, event_sources)]
+        pairs += [(ch["text"], s) for ch, s in zip(doc_chunks, doc_sources)]
+
+        # Build ONE aggregated item per event, each as soon as the last chunk of its src is in.
+        # Aggregation reads results in chunk order and items keep card order, so output does
+        # not depend on which call finishes first.
+        event_cards: List[Tuple[EventCard, Any, int]] = list(chain(
+            ((c, aggregate_standup_to_one_item, args.standup_llm_notes) for c in standup_cards),
+            ((c, aggregate_slack_to_one_item, args.slack_llm_notes) for c in slack_cards),
+            ((c, aggregate_email_to_one_item, args.email_llm_notes) for c in email_cards),
+        ))
+        cards_of_src: DefaultDict[str, List[int]] = defaultdict(list)
+        for ci, (c, _, _) in enumerate(event_cards):
+            cards_of_src[c.src].append(ci)
+        chunks_of_src: DefaultDict[str, List[int]] = defaultdict(list)
+        for i, ch in enumerate(event_chunks):
+            chunks_of_src[ch["src"]].append(i)
+        pending = {src: len(idx) for src, idx in chunks_of_src.items()}
+
+        results: List[Any] = [None] * len(pairs)
+        event_items: List[Optional[Dict[str, Any]]] = [None] * len(event_cards)
+
+        def aggregate_src(src: str) -> None:
+            # LLM extract on event chunks -> texts for this src (but don't add chunk items to final!)
+            llm_texts: List[str] = []
+            for i in chunks_of_src.get(src, []):
+                res = results[i]
+                if isinstance(res, Exception):
+                    continue
+                # one extend per chunk; filter(None, ...) drops the empty texts
+                llm_texts.extend(filter(None, [(it.get("text") or "").strip() for it in (res.get("items") or [])]))
+            for ci in cards_of_src[src]:
+                card, aggregate, max_notes = event_cards[ci]
+                event_items[ci] = aggregate(card, llm_texts, max_llm_notes=max_notes)
+
+        for src in cards_of_src:
+            if not pending.get(src):
+                aggregate_src(src)
+
+        failed = 0
+        if pairs:
+            # short chunks (typically one slack/email event each) can share a prompt
+            batched = llm_extract.extract_items_iter(pairs, k=args.llm_batch, small_chars=args.max_chars // 3)
+            for i, res in batched:
+                results[i] = res
+                if isinstance(res, Exception):
+                    failed += 1
+                    print(f"[warn] LLM extract failed on {pairs[i][1]}: {res}")
+                if i < len(event_chunks):
+                    src = event_chunks[i]["src"]
+                    pending[src] -= 1
+                    if pending[src] == 0 and src in cards_of_src:
+                        aggregate_src(src)
+
+        items: List[Dict[str, Any]] = [it for it in event_items if it is not None]
+
+        # LLM extraction on non-event docs (normal behavior)
+        for res in results[len(event_chunks):]:
+            if not isinstance(res, Exception):
+                items.extend(res.get("items", []))
 
-    # LLM extraction on non-event docs (normal behavior)
-    if not args.skip_llm_extract:
-        for ch in chunks:
-            source = f"{ch['doc_name']}:chunk{ch['chunk_id']}"
+        # Summarize (best-effort, opt-in: a full LLM round-trip over every item)
+        manager_summary: Optional[List[str]] = None
+        if args.summarize and isinstance(llm_summarize, NoneLLM):
+            # NoneLLM's summary is a "LLM disabled" placeholder, not a summary
+            print("[warn] --summarize needs a working --llm ollama; keeping the P0/P1/P2 counts.")
+        elif args.summarize:
             try:
-                res = llm_extract.extract_items(ch["text"], source=source)
-                items.extend(res.get("items", []))
+                manager_summary = llm_summarize.summarize(items).get("manager_summary")
+                if not manager_summary:
+                    print("[warn] LLM summary reply could not be parsed; keeping the P0/P1/P2 counts.")
             except Exception as e:
-                print(f"[warn] LLM extract failed on {source}: {e}")
-
-    # Summarize (best-effort)
-    try:
-        _ = llm_summarize.summarize(items)
-    except Exception:
-        pass
+                print(f"[warn] LLM summarize failed: {e}")
 
     generated_iso = datetime.now().isoformat(timespec="seconds")
-    report = build_report(items, generated_iso=generated_iso)
-
-    # Debug outputs
-    (out_dir / "standups.json").write_text(json.dumps(standup_cards, ensure_ascii=False, indent=2), encoding="utf-8")
-    (out_dir / "slack_events.json").write_text(json.dumps(slack_cards, ensure_ascii=False, indent=2), encoding="utf-8")
-    (out_dir / "email_events.json").write_text(json.dumps(email_cards, ensure_ascii=False, indent=2), encoding="utf-8")
-    (out_dir / "items.json").write_text(json.dumps(items, ensure_ascii=False, indent=2), encoding="utf-8")
-    (out_dir / "report.json").write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
-    (out_dir / "report.md").write_text(render_markdown_compact(report), encoding="utf-8")
-    (out_dir / "report.html").write_text(render_html_compact(report), encoding="utf-8")
+    report = build_report(items, generated_iso=generated_iso, manager_summary=manager_summary)
+
+    # Debug outputs + report
+    write_outputs(out_dir, [
+        ("standups.json", lambda: _json_bytes([c.to_dict() for c in standup_cards])),
+        ("slack_events.json", lambda: _json_bytes([c.to_dict() for c in slack_cards])),
+        ("email_events.json", lambda: _json_bytes([c.to_dict() for c in email_cards])),
+        ("items.json", lambda: _json_bytes(items)),
+        ("report.json", lambda: _json_bytes(report)),
+        ("report.md", lambda: render_markdown_compact(report)),
+        ("report.html", lambda: render_html_compact(report)),
+    ])
+
+    if failed:
+        print(f"\n[warn] LLM extract failed on {failed} of {len(pairs)} chunks (after retries); they added no items.")
 
     print("\n[ok] Outputs:")
     print(" -", out_dir / "report.md")